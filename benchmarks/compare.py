@@ -0,0 +1,71 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Exits with status 1 when any case's throughput drops, or p50/p99 latency
+grows, by more than ``--threshold`` percent.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+Key = Tuple[str, str, int]
+
+# metric -> True if larger is better
+METRICS = {"throughput_rps": True, "p50_ms": False, "p99_ms": False}
+
+
+def load(path: str) -> Dict[Key, Dict[str, Any]]:
+    with open(path, encoding="utf-8") as fh:
+        payload = json.load(fh)
+    return {
+        (r["scenario"], r["client"], r["concurrency"]): r for r in payload["results"]
+    }
+
+
+def compare(
+    baseline: Dict[Key, Dict[str, Any]],
+    candidate: Dict[Key, Dict[str, Any]],
+    threshold: float,
+) -> Tuple[List[str], List[str]]:
+    lines: List[str] = []
+    regressions: List[str] = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        label = "{:<14} {:<19} c={:<4}".format(*key)
+        cells = []
+        for metric, higher_is_better in METRICS.items():
+            before, after = old[metric], new[metric]
+            change = 100.0 * (after - before) / before if before else 0.0
+            cells.append(f"{metric}={after:.3f} ({change:+.1f}%)")
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"{label} {metric} {change:+.1f}%")
+        lines.append(f"{label} " + "  ".join(cells))
+    return lines, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    lines, regressions = compare(
+        load(args.baseline), load(args.candidate), args.threshold
+    )
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold}%:")
+        print("\n".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
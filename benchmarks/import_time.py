@@ -0,0 +1,85 @@
+"""
+Import-time benchmark: cold-start cost of each public entry point.
+
+Usage:
+    python -m benchmarks.import_time --repeat 15 --output import-time.json
+
+Every statement runs in a fresh interpreter; the child reports the wall time
+of the import, peak RSS and which HTTP backends ended up in sys.modules.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+STATEMENTS = {
+    "resilient_http": "import resilient_http",
+    "RetryPolicy": "from resilient_http import RetryPolicy",
+    "CircuitBreaker": "from resilient_http import CircuitBreaker",
+    "ResilientRequestsSession": "from resilient_http import ResilientRequestsSession",
+    "ResilientAsyncClient": "from resilient_http import ResilientAsyncClient",
+    "bare_requests": "import requests",
+    "bare_httpx": "import httpx",
+}
+
+_CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "requests_loaded": "requests" in sys.modules,
+    "httpx_loaded": "httpx" in sys.modules,
+}}))
+"""
+
+
+def measure(statement: str, repeat: int) -> Dict[str, Any]:
+    samples: List[Dict[str, Any]] = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(json.loads(out))
+    seconds = [s["seconds"] for s in samples]
+    return {
+        "statement": statement,
+        "median_ms": 1000 * statistics.median(seconds),
+        "min_ms": 1000 * min(seconds),
+        "max_rss_kb": statistics.median(s["max_rss_kb"] for s in samples),
+        "requests_loaded": samples[-1]["requests_loaded"],
+        "httpx_loaded": samples[-1]["httpx_loaded"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--output", default="import-time.json")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, statement in STATEMENTS.items():
+        row = measure(statement, args.repeat)
+        results[name] = row
+        print(
+            f"{name:<26} {row['median_ms']:>8.2f} ms  rss={row['max_rss_kb']:>8.0f} KB"
+            f"  requests={row['requests_loaded']!s:<5} httpx={row['httpx_loaded']}",
+            flush=True,
+        )
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump({"python": sys.version, "results": results}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Benchmark runner: compares the resilient clients against bare requests/httpx.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --scenario retry_storm --concurrency 1 16 --requests 500
+
+Each (scenario, client, concurrency) case records throughput, latency
+percentiles, peak traced memory and upstream amplification, and the whole run
+is written as JSON so that two versions can be diffed with
+``python -m benchmarks.compare``.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import requests
+
+import resilient_http
+from resilient_http.circuit_breaker import CircuitBreaker
+from resilient_http.resilient_async_client import ResilientAsyncClient
+from resilient_http.resilient_session import ResilientRequestsSession
+from resilient_http.retry_policy import RetryPolicy
+
+from .server import FaultConfig, FaultInjectingServer
+
+SCENARIOS: Dict[str, FaultConfig] = {
+    "healthy": FaultConfig(latency="0", seed=1),
+    "slow_upstream": FaultConfig(latency="lognormal:-6:0.5", seed=2),
+    "flaky_5xx": FaultConfig(latency="exp:0.001", error_rate=0.1, seed=3),
+    "retry_storm": FaultConfig(
+        latency="exp:0.001", error_rate=0.3, reset_rate=0.05, seed=4
+    ),
+    "throttled": FaultConfig(
+        latency="exp:0.001", throttle_rate=0.2, retry_after=0, seed=5
+    ),
+}
+
+SYNC_CLIENTS = ("requests", "resilient_requests")
+ASYNC_CLIENTS = ("httpx", "resilient_httpx")
+CLIENTS = SYNC_CLIENTS + ASYNC_CLIENTS
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+def make_policy(args: argparse.Namespace) -> RetryPolicy:
+    delay = args.backoff_ms / 1000.0
+    return RetryPolicy(max_attempts=args.max_attempts, backoff=lambda attempt: delay)
+
+
+def make_breaker(args: argparse.Namespace) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=args.breaker_threshold, recovery_timeout=0.05
+    )
+
+
+# Sync clients
+def _sync_worker(
+    client: str, url: str, count: int, args: argparse.Namespace
+) -> Tuple[List[float], int]:
+    if client == "requests":
+        session: Any = requests.Session()
+        close: Callable[[], None] = session.close
+    else:
+        session = ResilientRequestsSession(
+            retry_policy=make_policy(args), circuit_breaker=make_breaker(args)
+        )
+        close = session.session.close
+
+    latencies: List[float] = []
+    errors = 0
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            try:
+                response = session.get(url)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+    finally:
+        close()
+    return latencies, errors
+
+
+def run_sync(
+    client: str, url: str, total: int, concurrency: int, args: argparse.Namespace
+) -> Tuple[List[float], int]:
+    shares = [
+        total // concurrency + (i < total % concurrency) for i in range(concurrency)
+    ]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_sync_worker, client, url, n, args) for n in shares if n]
+        results = [f.result() for f in futures]
+    latencies = [lat for lats, _ in results for lat in lats]
+    return latencies, sum(err for _, err in results)
+
+
+# Async clients
+async def _run_async(
+    client: str, url: str, total: int, concurrency: int, args: argparse.Namespace
+) -> Tuple[List[float], int]:
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    inner = httpx.AsyncClient(limits=limits)
+    wrapper: Any = inner
+    if client == "resilient_httpx":
+        wrapper = ResilientAsyncClient(
+            client=inner,
+            retry_policy=make_policy(args),
+            circuit_breaker=make_breaker(args),
+        )
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await wrapper.get(url)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await inner.aclose()
+    return latencies, errors
+
+
+def run_async(
+    client: str, url: str, total: int, concurrency: int, args: argparse.Namespace
+) -> Tuple[List[float], int]:
+    return asyncio.run(_run_async(client, url, total, concurrency, args))
+
+
+def run_case(
+    server: FaultInjectingServer,
+    scenario: str,
+    client: str,
+    concurrency: int,
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    runner = run_sync if client in SYNC_CLIENTS else run_async
+    url = server.url + "/bench"
+
+    # Warm-up (connection setup, imports, first-call caches)
+    server.configure(SCENARIOS["healthy"])
+    runner(client, url, min(args.warmup, args.requests), concurrency, args)
+
+    server.configure(SCENARIOS[scenario])
+    server.reset_counters()
+    started = time.perf_counter()
+    latencies, errors = runner(client, url, args.requests, concurrency, args)
+    elapsed = time.perf_counter() - started
+    upstream = server.requests_served
+
+    peak_memory: Optional[int] = None
+    if args.memory_requests:
+        server.configure(SCENARIOS[scenario])
+        tracemalloc.start()
+        try:
+            runner(client, url, args.memory_requests, concurrency, args)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "client": client,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_ms": 1000 * percentile(latencies, 50),
+        "p99_ms": 1000 * percentile(latencies, 99),
+        "upstream_requests": upstream,
+        "amplification": upstream / len(latencies) if latencies else 0.0,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def add_overhead(results: List[Dict[str, Any]]) -> None:
+    """Annotate resilient rows with their latency overhead vs. the bare client."""
+    baseline_for = {"resilient_requests": "requests", "resilient_httpx": "httpx"}
+    index = {(r["scenario"], r["client"], r["concurrency"]): r for r in results}
+    for row in results:
+        bare = baseline_for.get(row["client"])
+        base = index.get((row["scenario"], bare, row["concurrency"]))
+        if base is None:
+            continue
+        row["p50_overhead_ms"] = row["p50_ms"] - base["p50_ms"]
+        row["p99_overhead_ms"] = row["p99_ms"] - base["p99_ms"]
+        row["throughput_ratio"] = (
+            row["throughput_rps"] / base["throughput_rps"]
+            if base["throughput_rps"]
+            else 0.0
+        )
+
+
+def metadata() -> Dict[str, Any]:
+    return {
+        "resilient_http": resilient_http.__version__,
+        "requests": requests.__version__,
+        "httpx": httpx.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--client", nargs="+", choices=CLIENTS, default=list(CLIENTS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument(
+        "--memory-requests",
+        type=int,
+        default=200,
+        help="requests traced with tracemalloc in a separate pass (0 disables)",
+    )
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument(
+        "--backoff-ms",
+        type=float,
+        default=0.0,
+        help="constant backoff for resilient clients; 0 measures pure overhead",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=1_000_000,
+        help="failures before the breaker opens (default: effectively never)",
+    )
+    parser.add_argument("--output", default="benchmark-results.json")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results: List[Dict[str, Any]] = []
+
+    with FaultInjectingServer() as server:
+        for scenario in args.scenario:
+            for concurrency in args.concurrency:
+                for client in args.client:
+                    row = run_case(server, scenario, client, concurrency, args)
+                    results.append(row)
+                    print(
+                        f"{scenario:<14} {client:<19} c={concurrency:<4} "
+                        f"{row['throughput_rps']:>9.1f} rps  "
+                        f"p50={row['p50_ms']:.3f}ms p99={row['p99_ms']:.3f}ms "
+                        f"amp={row['amplification']:.2f} errors={row['errors']}",
+                        flush=True,
+                    )
+
+    add_overhead(results)
+    payload = {"meta": metadata(), "config": vars(args), "results": results}
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    print(f"wrote {len(results)} results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Local fault-injecting HTTP/1.1 server used by the benchmark suite.
+
+The server runs its own asyncio loop in a background thread so that both the
+sync (``requests``) and async (``httpx``) clients can be pointed at it from the
+same process. Every response is shaped by a :class:`FaultConfig`:
+
+    latency      -> sleep drawn from a distribution before answering
+    error_rate   -> fraction of requests answered with 503
+    throttle_rate-> fraction answered with 429 + Retry-After
+    reset_rate   -> fraction whose connection is aborted without a response
+"""
+
+import asyncio
+import random
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Build a latency sampler (seconds) from a short spec string:
+        "0"                 -> no delay
+        "const:0.002"       -> fixed delay
+        "uniform:0.001:0.01"-> uniform between the two bounds
+        "exp:0.005"         -> exponential with the given mean
+        "lognormal:-5:0.5"  -> lognormal with mu / sigma of the underlying normal
+    """
+    kind, _, rest = spec.partition(":")
+    args = [float(a) for a in rest.split(":")] if rest else []
+
+    if kind in ("0", "none", ""):
+        return lambda rng: 0.0
+    if kind == "const":
+        (value,) = args
+        return lambda rng: value
+    if kind == "uniform":
+        low, high = args
+        return lambda rng: rng.uniform(low, high)
+    if kind == "exp":
+        (mean,) = args
+        return lambda rng: rng.expovariate(1.0 / mean)
+    if kind == "lognormal":
+        mu, sigma = args
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+@dataclass
+class FaultConfig:
+    """Fault profile applied to every request the server receives."""
+
+    latency: str = "0"
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    reset_rate: float = 0.0
+    retry_after: float = 0.0
+    seed: Optional[int] = None
+
+    def validate(self) -> None:
+        total = self.error_rate + self.throttle_rate + self.reset_rate
+        if not 0.0 <= total <= 1.0:
+            raise ValueError(
+                "error_rate + throttle_rate + reset_rate must be in [0, 1]"
+            )
+        parse_latency(self.latency)
+
+
+_REASONS = {200: "OK", 429: "Too Many Requests", 503: "Service Unavailable"}
+
+
+class FaultInjectingServer:
+    """Minimal keep-alive HTTP/1.1 server with configurable faults."""
+
+    def __init__(
+        self, config: Optional[FaultConfig] = None, host: str = "127.0.0.1"
+    ) -> None:
+        self.config = config or FaultConfig()
+        self.config.validate()
+        self.host = host
+        self.port = 0
+        self.requests_served = 0
+        self._rng = random.Random(self.config.seed)
+        self._latency = parse_latency(self.config.latency)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def configure(self, config: FaultConfig) -> None:
+        """Swap the fault profile; takes effect for the next request."""
+        config.validate()
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._latency = parse_latency(config.latency)
+
+    def reset_counters(self) -> None:
+        self.requests_served = 0
+
+    # Lifecycle
+    def start(self) -> "FaultInjectingServer":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._loop = None
+
+    def __enter__(self) -> "FaultInjectingServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._server = loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, 0, backlog=1024)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+    # Request handling
+    def _pick_outcome(self) -> Tuple[str, int]:
+        cfg = self.config
+        roll = self._rng.random()
+        if roll < cfg.reset_rate:
+            return "reset", 0
+        roll -= cfg.reset_rate
+        if roll < cfg.error_rate:
+            return "respond", 503
+        roll -= cfg.error_rate
+        if roll < cfg.throttle_rate:
+            return "respond", 429
+        return "respond", 200
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+
+                length = 0
+                for line in head.split(b"\r\n")[1:]:
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value.strip())
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests_served += 1
+                delay = self._latency(self._rng)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                action, status = self._pick_outcome()
+                if action == "reset":
+                    writer.transport.abort()
+                    return
+
+                body = b"ok" if status == 200 else b"fault"
+                headers = [
+                    f"HTTP/1.1 {status} {_REASONS[status]}",
+                    f"Content-Length: {len(body)}",
+                    "Content-Type: text/plain",
+                    "Connection: keep-alive",
+                ]
+                if status == 429:
+                    headers.append(f"Retry-After: {self.config.retry_after:g}")
+                writer.write("\r\n".join(headers).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        finally:
+            if not writer.is_closing():
+                writer.close()
@@ -1,8 +1,43 @@
-from .retry_policy import RetryPolicy
-from .circuit_breaker import CircuitBreaker
-from .resilient_session import ResilientRequestsSession
-from .resilient_async_client import ResilientAsyncClient
-from .metrics import MetricsSink, InMemoryMetricsSink
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .retry_policy import RetryPolicy
+    from .circuit_breaker import CircuitBreaker
+    from .resilient_session import ResilientRequestsSession
+    from .resilient_async_client import ResilientAsyncClient
+    from .metrics import MetricsSink, InMemoryMetricsSink, BufferedMetricsSink
+    from .pipeline import Middleware, Pipeline
+    from .replica_pool import ReplicaPool
+    from .load_shedding import Priority, PriorityScheduler
+    from .tracing import Tracer, PhaseProfiler
+    from .sharding import ClientShards
+    from .multiprocess import MultiProcessMetricsSink, MultiProcessCollector
+    from .log_strategy import LogStrategy
+
+# Public name -> submodule. Resolved on first attribute access (PEP 562) so that
+# `import resilient_http` loads neither requests nor httpx until a client that
+# needs them is actually used.
+_LAZY_ATTRS: Dict[str, str] = {
+    "RetryPolicy": ".retry_policy",
+    "CircuitBreaker": ".circuit_breaker",
+    "ResilientRequestsSession": ".resilient_session",
+    "ResilientAsyncClient": ".resilient_async_client",
+    "MetricsSink": ".metrics",
+    "InMemoryMetricsSink": ".metrics",
+    "BufferedMetricsSink": ".metrics",
+    "Middleware": ".pipeline",
+    "Pipeline": ".pipeline",
+    "ReplicaPool": ".replica_pool",
+    "Priority": ".load_shedding",
+    "PriorityScheduler": ".load_shedding",
+    "Tracer": ".tracing",
+    "PhaseProfiler": ".tracing",
+    "ClientShards": ".sharding",
+    "MultiProcessMetricsSink": ".multiprocess",
+    "MultiProcessCollector": ".multiprocess",
+    "LogStrategy": ".log_strategy",
+}
 
 __all__ = [
     "RetryPolicy",
@@ -11,6 +46,31 @@ __all__ = [
     "ResilientAsyncClient",
     "MetricsSink",
     "InMemoryMetricsSink",
+    "BufferedMetricsSink",
+    "Middleware",
+    "Pipeline",
+    "ReplicaPool",
+    "Priority",
+    "PriorityScheduler",
+    "Tracer",
+    "PhaseProfiler",
+    "ClientShards",
+    "MultiProcessMetricsSink",
+    "MultiProcessCollector",
+    "LogStrategy",
 ]
 
 __version__ = "1.0.12"
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -1,5 +1,5 @@
 import random
-from typing import Callable
+from typing import Callable, Optional
 
 
 def exponential_backoff(
@@ -18,26 +18,33 @@ def exponential_backoff(
     return _fn
 
 
-def full_jitter(backoff_fn: Callable[[int], float]) -> Callable[[int], float]:
+def full_jitter(
+    backoff_fn: Callable[[int], float], rng: Optional[random.Random] = None
+) -> Callable[[int], float]:
     """
     AWS-style full jitter:
         sleep(random(0, exponential))
+    Pass a seeded ``rng`` for reproducible delays (e.g. in simulations).
     """
+    source = rng or random
 
     def _fn(attempt: int) -> float:
-        return random.uniform(0, backoff_fn(attempt))
+        return source.uniform(0, backoff_fn(attempt))
 
     return _fn
 
 
-def equal_jitter(backoff_fn: Callable[[int], float]) -> Callable[[int], float]:
+def equal_jitter(
+    backoff_fn: Callable[[int], float], rng: Optional[random.Random] = None
+) -> Callable[[int], float]:
     """
     Google SRE equal jitter:
         sleep(backoff/2 + random(0, backoff/2))
     """
+    source = rng or random
 
     def _fn(attempt: int) -> float:
         d = backoff_fn(attempt)
-        return d / 2 + random.uniform(0, d / 2)
+        return d / 2 + source.uniform(0, d / 2)
 
     return _fn
@@ -1,8 +1,9 @@
 import time
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, Callable, Optional, Set
+from typing import Any, Dict, Callable, Optional, Set
 from .metrics import MetricsSink
+from .log_strategy import DEFAULT_LOG_STRATEGY, LogStrategy
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,12 @@ class CircuitBreaker:
     on_half_open: Optional[Callable[[str], None]] = None
     on_closed: Optional[Callable[[str], None]] = None
 
+    # Monotonic by default so wall-clock jumps cannot reopen or close circuits
+    clock: Callable[[], float] = time.monotonic
+
+    # Sampling / rate limiting for transition logs
+    log_strategy: LogStrategy = DEFAULT_LOG_STRATEGY
+
     _failures: Dict[str, int] = field(default_factory=dict)
     _open_until: Dict[str, float] = field(default_factory=dict)
     _half_open_calls: Dict[str, int] = field(default_factory=dict)
@@ -43,14 +50,14 @@ class CircuitBreaker:
 
     def state(self, key: str) -> str:
         """Return current state: closed / open / half-open"""
-        now = time.time()
+        now = self.clock()
         if key in self._open_until:
             if now >= self._open_until[key]:
                 if key not in self._half_open_notified:
                     self._half_open_notified.add(key)
                     if callable(self.on_half_open):
                         self.on_half_open(key)
-                    logger.info(f'event="cb_half_open" key="{key}"')
+                    self.log_strategy.log(logger, logging.INFO, "cb_half_open", key)
                     if self.metrics:
                         self.metrics.record_circuit_state(key, "half-open")
                 return "half-open"
@@ -67,23 +74,37 @@ class CircuitBreaker:
         if was_open:
             if callable(self.on_closed):
                 self.on_closed(key)
-            logger.info(f'event="cb_closed" key="{key}"')
+            self.log_strategy.log(logger, logging.INFO, "cb_closed", key)
             if self.metrics:
                 self.metrics.record_circuit_state(key, "closed")
 
     def record_failure(self, key: str) -> None:
         self._failures[key] = self._failures.get(key, 0) + 1
         if self._failures[key] >= self.failure_threshold:
-            already_open = key in self._open_until
-            self._open_until[key] = time.time() + self.recovery_timeout
-            if not already_open:
-                logger.info(
-                    f'event="cb_open" key="{key}" failures={self._failures.get(key, 0)}'
-                )
-                if self.metrics:
-                    self.metrics.record_circuit_state(key, "open")
-                if callable(self.on_open):
-                    self.on_open(key)
+            self._open(key)
+
+    def trip(self, key: str) -> None:
+        """Force the circuit open for key, e.g. on an external outlier signal."""
+        self._failures[key] = max(self._failures.get(key, 0), self.failure_threshold)
+        self._open(key)
+
+    def _open(self, key: str) -> None:
+        already_open = key in self._open_until
+        self._open_until[key] = self.clock() + self.recovery_timeout
+        self._half_open_calls.pop(key, None)
+        self._half_open_notified.discard(key)
+        if not already_open:
+            self.log_strategy.log(
+                logger,
+                logging.INFO,
+                "cb_open",
+                key,
+                failures=self._failures.get(key, 0),
+            )
+            if self.metrics:
+                self.metrics.record_circuit_state(key, "open")
+            if callable(self.on_open):
+                self.on_open(key)
 
     def allow_call(self, key: str) -> bool:
         """Check if a request is allowed under current state."""
@@ -97,3 +118,48 @@ class CircuitBreaker:
             self._half_open_calls[key] = calls + 1
             return True
         return False
+
+    def release_probe(self, key: str) -> None:
+        """
+        Give back a half-open probe slot taken by allow_call() when the call
+        ended without an outcome (e.g. it was cancelled).
+        """
+        calls = self._half_open_calls.get(key, 0)
+        if calls > 0:
+            self._half_open_calls[key] = calls - 1
+
+    # Persistence
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Compact, clock-independent view of the breaker state: non-zero failure
+        counts and the remaining open time (seconds) of each open circuit.
+        """
+        now = self.clock()
+        return {
+            "failures": {k: n for k, n in self._failures.items() if n},
+            "open": {k: max(0.0, t - now) for k, t in self._open_until.items()},
+        }
+
+    def restore(self, state: Dict[str, Any], elapsed: float = 0.0) -> None:
+        """
+        Load a snapshot, re-basing open circuits onto this breaker's clock.
+
+        ``elapsed`` is the time that passed since the snapshot was taken (e.g.
+        process downtime); it is deducted from the remaining open time, so
+        circuits whose recovery window already expired restore as half-open.
+        """
+        now = self.clock()
+        # Convert everything first so a malformed snapshot changes nothing
+        failures = {str(k): int(n) for k, n in state.get("failures", {}).items()}
+        open_until = {
+            str(k): now + max(0.0, float(remaining) - elapsed)
+            for k, remaining in state.get("open", {}).items()
+        }
+        self._failures.update(failures)
+        for key, until in open_until.items():
+            self._open_until[key] = until
+            self._half_open_calls.pop(key, None)
+            self._half_open_notified.discard(key)
+        logger.info(
+            'event="cb_restored" open=%d tracked=%d', len(open_until), len(failures)
+        )
@@ -12,3 +12,7 @@ class CircuitBreakerOpenError(ResilientHTTPError):
 
 class RetryError(ResilientHTTPError):
     """Raised when a retryable response or exception triggers a retry."""
+
+
+class LoadShedError(ResilientHTTPError):
+    """Request was shed by the priority scheduler because the host is saturated."""
@@ -0,0 +1,257 @@
+import heapq
+import asyncio
+import logging
+import threading
+import itertools
+from enum import IntEnum
+from urllib.parse import urlsplit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import MetricsSink
+from .exceptions import LoadShedError
+from .log_strategy import DEFAULT_LOG_STRATEGY, LogStrategy
+from .pipeline import STAGE_BULKHEAD, AsyncSend, Middleware, RequestContext, Send
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request criticality; lower values are admitted first."""
+
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+
+
+_WAITING, _GRANTED, _EVICTED, _ABANDONED = range(4)
+
+
+class _Waiter:
+    __slots__ = ("priority", "state", "future", "loop", "event")
+
+    def __init__(self, priority: int, asynchronous: bool) -> None:
+        self.priority = priority
+        self.state = _WAITING
+        self.future: Optional["asyncio.Future[None]"] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.event: Optional[threading.Event] = None
+        if asynchronous:
+            self.loop = asyncio.get_running_loop()
+            self.future = self.loop.create_future()
+        else:
+            self.event = threading.Event()
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        elif self.loop is not None:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if self.future is not None and not self.future.done():
+            self.future.set_result(None)
+
+
+class _HostState:
+    __slots__ = ("in_flight", "queue")
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.queue: List[Tuple[int, int, _Waiter]] = []
+
+
+def host_key(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+class PriorityScheduler:
+    """
+    Per-host admission control with priority queueing and load shedding.
+
+    Up to ``max_in_flight`` calls per host run concurrently. When a host is
+    saturated, calls at ``shed_priority`` or lower are shed at once. More
+    important calls wait in a priority queue and are admitted most-critical
+    first. A queued call is shed after ``max_queue_time`` seconds. When the queue
+    is full, a new call evicts the least important waiter if it outranks it.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        max_queue_time: float = 1.0,
+        max_queue_size: int = 1000,
+        shed_priority: Priority = Priority.LOW,
+        key_fn: Callable[[str], str] = host_key,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if max_queue_time < 0:
+            raise ValueError("max_queue_time must be >= 0")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must be >= 0")
+        self.max_in_flight = max_in_flight
+        self.max_queue_time = max_queue_time
+        self.max_queue_size = max_queue_size
+        self.shed_priority = shed_priority
+        self.key_fn = key_fn
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def in_flight(self, host: str) -> int:
+        state = self._hosts.get(host)
+        return state.in_flight if state else 0
+
+    def queued(self, host: str) -> int:
+        state = self._hosts.get(host)
+        if not state:
+            return 0
+        return sum(1 for _, _, w in state.queue if w.state == _WAITING)
+
+    # Admission
+    def _try_admit(
+        self, host: str, priority: int, asynchronous: bool
+    ) -> Optional[_Waiter]:
+        """Admit immediately (None), enqueue (waiter) or raise LoadShedError."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+
+        # drop waiters that already gave up or were evicted
+        while state.queue and state.queue[0][2].state != _WAITING:
+            heapq.heappop(state.queue)
+
+        if state.in_flight < self.max_in_flight and not state.queue:
+            state.in_flight += 1
+            return None
+
+        if priority >= self.shed_priority:
+            raise LoadShedError(f"Shed call to {host!r}: host saturated")
+
+        waiting = [entry for entry in state.queue if entry[2].state == _WAITING]
+        if len(waiting) >= self.max_queue_size:
+            worst = max(waiting, default=None)
+            if worst is None or worst[0] <= priority:
+                raise LoadShedError(f"Shed call to {host!r}: queue full")
+            worst[2].state = _EVICTED
+            worst[2].wake()
+
+        waiter = _Waiter(priority, asynchronous)
+        heapq.heappush(state.queue, (priority, next(self._seq), waiter))
+        return waiter
+
+    def _finish_wait(self, host: str, waiter: _Waiter) -> None:
+        """Resolve a waiter after its wait ended; raises if it was not granted."""
+        if waiter.state == _GRANTED:
+            return
+        if waiter.state == _EVICTED:
+            raise LoadShedError(f"Shed call to {host!r}: evicted by higher priority")
+        waiter.state = _ABANDONED
+        raise LoadShedError(f"Shed call to {host!r}: queue time exceeded")
+
+    def acquire(self, host: str, priority: int = Priority.NORMAL) -> None:
+        with self._lock:
+            waiter = self._try_admit(host, priority, asynchronous=False)
+        if waiter is None:
+            return
+        assert waiter.event is not None
+        waiter.event.wait(self.max_queue_time)
+        with self._lock:
+            self._finish_wait(host, waiter)
+
+    async def acquire_async(self, host: str, priority: int = Priority.NORMAL) -> None:
+        with self._lock:
+            waiter = self._try_admit(host, priority, asynchronous=True)
+        if waiter is None:
+            return
+        assert waiter.future is not None
+        try:
+            await asyncio.wait_for(waiter.future, self.max_queue_time)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.state == _GRANTED
+                waiter.state = _ABANDONED
+            if granted:
+                self.release(host)
+            raise
+        with self._lock:
+            self._finish_wait(host, waiter)
+
+    def release(self, host: str) -> None:
+        """Free a slot, handing it to the most critical queued call if any."""
+        with self._lock:
+            state = self._hosts[host]
+            while state.queue:
+                _, _, waiter = heapq.heappop(state.queue)
+                if waiter.state == _WAITING:
+                    waiter.state = _GRANTED
+                    waiter.wake()
+                    return
+            state.in_flight -= 1
+
+
+class LoadSheddingMiddleware(Middleware):
+    """
+    Bulkhead stage: admits calls through a PriorityScheduler.
+
+    Relative URLs (e.g. paths resolved later by a replica pool) have no host
+    yet at this stage; they are admitted under ``default_key`` instead.
+    """
+
+    stage = STAGE_BULKHEAD
+
+    def __init__(
+        self,
+        scheduler: PriorityScheduler,
+        metrics: Optional[MetricsSink] = None,
+        log_strategy: Optional[LogStrategy] = None,
+        default_key: str = "",
+    ) -> None:
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.log_strategy = log_strategy or DEFAULT_LOG_STRATEGY
+        self.default_key = default_key
+
+    def _host(self, ctx: RequestContext) -> str:
+        return self.scheduler.key_fn(ctx.url) or self.default_key
+
+    def _shed(self, ctx: RequestContext, priority: int, exc: LoadShedError) -> None:
+        self.log_strategy.log(
+            logger, logging.INFO, "load_shed", ctx.key, priority=priority, reason=exc
+        )
+        # record_shed is optional on custom sinks
+        record_shed: Any = getattr(self.metrics, "record_shed", None)
+        if record_shed is not None:
+            label = (
+                priority.name.lower() if isinstance(priority, Priority) else priority
+            )
+            record_shed(ctx.key, str(label), str(exc))
+
+    def handle(self, ctx: RequestContext, call_next: Send) -> Any:
+        priority = ctx.extensions.get("priority", Priority.NORMAL)
+        host = self._host(ctx)
+        try:
+            self.scheduler.acquire(host, priority)
+        except LoadShedError as exc:
+            self._shed(ctx, priority, exc)
+            raise
+        try:
+            return call_next(ctx)
+        finally:
+            self.scheduler.release(host)
+
+    async def ahandle(self, ctx: RequestContext, call_next: AsyncSend) -> Any:
+        priority = ctx.extensions.get("priority", Priority.NORMAL)
+        host = self._host(ctx)
+        try:
+            await self.scheduler.acquire_async(host, priority)
+        except LoadShedError as exc:
+            self._shed(ctx, priority, exc)
+            raise
+        try:
+            return await call_next(ctx)
+        finally:
+            self.scheduler.release(host)
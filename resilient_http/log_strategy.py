@@ -0,0 +1,188 @@
+import time
+import random
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class _EventMessage:
+    """Log message rendered as ``event="..." key="..." k=v ...`` only when formatted."""
+
+    __slots__ = ("event", "key", "fields")
+
+    def __init__(self, event: str, key: str, fields: Dict[str, Any]) -> None:
+        self.event = event
+        self.key = key
+        self.fields = fields
+
+    def __str__(self) -> str:
+        parts = [f'event="{self.event}" key="{self.key}"']
+        parts.extend(f"{name}={value}" for name, value in self.fields.items())
+        return " ".join(parts)
+
+
+class _Window:
+    __slots__ = ("start", "emitted", "suppressed", "logger", "level")
+
+    def __init__(self, start: float, logger: logging.Logger, level: int) -> None:
+        self.start = start
+        self.emitted = 0
+        self.suppressed = 0
+        self.logger = logger
+        self.level = level
+
+
+class LogStrategy:
+    """
+    Controls how hot-path events (retries, breaker transitions and rejections,
+    load shedding) are logged.
+
+    - Nothing is formatted unless the logger is enabled for the level.
+    - ``sample_rate`` keeps that fraction of events at random; kept events
+      carry ``sample_rate`` so counts can be scaled back up.
+    - ``rate_limit`` caps each (event, key) pair to that many records per
+      ``period`` seconds. The first record of the next window carries
+      ``suppressed=N`` for what was dropped; flush() reports leftovers.
+      At most ``max_keys`` pairs are tracked; beyond that the least recently
+      used one is evicted and its pending count is reported by flush() under
+      key ``*``.
+
+    Records carry their fields as ``extra=`` attributes (``event``, ``key``
+    and the event's own fields) for structured handlers, and render as
+    ``event="cb_open" key="GET https://api" failures=5`` for plain ones.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        rate_limit: Optional[int] = None,
+        period: float = 1.0,
+        max_keys: int = 10_000,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        if rate_limit is not None and rate_limit < 1:
+            raise ValueError("rate_limit must be >= 1")
+        if period <= 0:
+            raise ValueError("period must be > 0")
+        if max_keys < 1:
+            raise ValueError("max_keys must be >= 1")
+
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self.period = period
+        self.max_keys = max_keys
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows: "OrderedDict[Tuple[str, str], _Window]" = OrderedDict()
+        self._last_prune = clock()
+        # Suppressed counts of evicted windows, reported by flush()
+        self._evicted: Dict[str, int] = {}
+        self._evicted_target: Optional[Tuple[logging.Logger, int]] = None
+
+    def log(
+        self, logger: logging.Logger, level: int, event: str, key: str, **fields: Any
+    ) -> None:
+        if not logger.isEnabledFor(level):
+            return
+        if self.sample_rate < 1.0:
+            if self._rng.random() >= self.sample_rate:
+                return
+            fields["sample_rate"] = self.sample_rate
+        if self.rate_limit is not None:
+            suppressed = self._admit(logger, level, event, key)
+            if suppressed is None:
+                return
+            if suppressed:
+                fields["suppressed"] = suppressed
+        self._emit(logger, level, event, key, fields)
+
+    @staticmethod
+    def _emit(
+        logger: logging.Logger,
+        level: int,
+        event: str,
+        key: str,
+        fields: Dict[str, Any],
+    ) -> None:
+        logger.log(
+            level,
+            _EventMessage(event, key, fields),
+            extra={"event": event, "key": key, **fields},
+        )
+
+    def _admit(
+        self, logger: logging.Logger, level: int, event: str, key: str
+    ) -> Optional[int]:
+        """None to drop the record, else the count suppressed since the last one."""
+        assert self.rate_limit is not None
+        now = self._clock()
+        with self._lock:
+            pair = (event, key)
+            window = self._windows.get(pair)
+            if window is None:
+                if len(self._windows) >= self.max_keys:
+                    self._make_room(now)
+                window = self._windows[pair] = _Window(now, logger, level)
+            else:
+                self._windows.move_to_end(pair)
+                if now - window.start >= self.period:
+                    window.start, window.emitted = now, 0
+            if window.emitted >= self.rate_limit:
+                window.suppressed += 1
+                return None
+            window.emitted += 1
+            suppressed, window.suppressed = window.suppressed, 0
+            return suppressed
+
+    def _make_room(self, now: float) -> None:
+        """Bring the tracked pairs under max_keys; caller holds the lock."""
+        windows = self._windows
+        # A full sweep is O(n), so do it at most once per period
+        if now - self._last_prune >= self.period:
+            self._last_prune = now
+            for pair in [
+                pair
+                for pair, window in windows.items()
+                if not window.suppressed and now - window.start >= self.period
+            ]:
+                del windows[pair]
+        while len(windows) >= self.max_keys:
+            (event, _), window = windows.popitem(last=False)
+            if window.suppressed:
+                self._evicted[event] = self._evicted.get(event, 0) + window.suppressed
+                self._evicted_target = (window.logger, window.level)
+
+    def flush(self) -> None:
+        """Log an ``events_suppressed`` record for every pair with dropped events."""
+        with self._lock:
+            pending: List[Tuple[str, str, logging.Logger, int, int]] = []
+            for (event, key), window in self._windows.items():
+                if window.suppressed:
+                    pending.append(
+                        (event, key, window.logger, window.level, window.suppressed)
+                    )
+                    window.suppressed = 0
+            if self._evicted_target is not None:
+                evicted_logger, evicted_level = self._evicted_target
+                for event, count in self._evicted.items():
+                    pending.append((event, "*", evicted_logger, evicted_level, count))
+                self._evicted.clear()
+                self._evicted_target = None
+        for event, key, target, level, count in pending:
+            if target.isEnabledFor(level):
+                self._emit(
+                    target,
+                    level,
+                    "events_suppressed",
+                    key,
+                    {"suppressed_event": event, "suppressed": count},
+                )
+
+
+# Shared default: log every event, formatted lazily.
+DEFAULT_LOG_STRATEGY = LogStrategy()
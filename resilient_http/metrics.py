@@ -1,5 +1,18 @@
+import os
+import copy
+import weakref
+import logging
 import threading
-from typing import Protocol, Dict, Any, List
+from collections import deque
+from typing import Protocol, Dict, Any, Deque, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STATE_FIELDS = {
+    "open": "open_events",
+    "half-open": "half_open_events",
+    "closed": "closed_events",
+}
 
 
 class MetricsSink(Protocol):
@@ -21,45 +34,82 @@ class InMemoryMetricsSink:
         self._lock = threading.Lock()
         self.data: Dict[str, Dict[str, Any]] = {}
 
-    def _get_entry(self, key: str) -> Dict[str, Any]:
+    @staticmethod
+    def _new_entry() -> Dict[str, Any]:
+        return {
+            "retries": 0,
+            "failures": 0,
+            "successes": 0,
+            "open_events": 0,
+            "half_open_events": 0,
+            "closed_events": 0,
+            "shed": 0,
+            "latencies": [],
+        }
+
+    def _apply(self, name: str, args: Tuple[Any, ...]) -> None:
+        """Apply one event to the data; caller holds the lock."""
+        key = args[0]
+        entry = self.data.get(key)
+        if entry is None:
+            entry = self.data[key] = self._new_entry()
+        if name == "record_retry":
+            entry["retries"] += 1
+        elif name == "record_circuit_state":
+            state_field = _STATE_FIELDS.get(args[1])
+            if state_field:
+                entry[state_field] += 1
+        elif name == "record_request_latency":
+            entry["latencies"].append(args[1])
+            entry["successes" if args[2] else "failures"] += 1
+        elif name == "record_shed":
+            entry["shed"] += 1
+
+    def record_batch(self, events: Iterable[Tuple[str, Tuple[Any, ...]]]) -> None:
+        """Apply buffered (method_name, args) events under one lock acquisition."""
         with self._lock:
-            if key not in self.data:
-                entry: Dict[str, Any] = {
-                    "retries": 0,
-                    "failures": 0,
-                    "successes": 0,
-                    "open_events": 0,
-                    "half_open_events": 0,
-                    "closed_events": 0,
-                    "latencies": [],
-                }
-                self.data[key] = entry
-            return self.data[key]
+            for name, args in events:
+                self._apply(name, args)
 
     def record_retry(self, key: str, attempt: int, reason: str, delay: float) -> None:
-        entry = self._get_entry(key)
-        entry["retries"] += 1
-        print(
-            f"[metrics] RETRY key={key} attempt={attempt} delay={delay:.3f}s reason={reason}"
+        with self._lock:
+            self._apply("record_retry", (key, attempt, reason, delay))
+        logger.debug(
+            "[metrics] RETRY key=%s attempt=%s delay=%.3fs reason=%s",
+            key,
+            attempt,
+            delay,
+            reason,
         )
 
     def record_circuit_state(self, key: str, state: str) -> None:
-        entry = self._get_entry(key)
-        if state == "open":
-            entry["open_events"] += 1
-        elif state == "half-open":
-            entry["half_open_events"] += 1
-        elif state == "closed":
-            entry["closed_events"] += 1
-        print(f"[metrics] CB key={key} state={state}")
+        with self._lock:
+            self._apply("record_circuit_state", (key, state))
+        logger.debug("[metrics] CB key=%s state=%s", key, state)
+
+    def record_shed(self, key: str, priority: str, reason: str) -> None:
+        with self._lock:
+            self._apply("record_shed", (key, priority, reason))
+        logger.debug(
+            "[metrics] SHED key=%s priority=%s reason=%s", key, priority, reason
+        )
 
     def record_request_latency(self, key: str, latency: float, success: bool) -> None:
-        entry = self._get_entry(key)
-        entry["latencies"].append(latency)
-        if success:
-            entry["successes"] += 1
-        else:
-            entry["failures"] += 1
+        with self._lock:
+            self._apply("record_request_latency", (key, latency, success))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Deep copy of the collected data, safe to serialize."""
+        with self._lock:
+            return copy.deepcopy(self.data)
+
+    def restore(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the collected data with a previous snapshot()."""
+        with self._lock:
+            self.data = {
+                key: {**self._new_entry(), **copy.deepcopy(entry)}
+                for key, entry in data.items()
+            }
 
     def summary(self) -> Dict[str, Dict[str, Any]]:
         """Return summarized view for dashboards or export."""
@@ -71,3 +121,183 @@ class InMemoryMetricsSink:
             return 0.0
         latencies: List[float] = entry["latencies"]
         return sum(latencies) / len(latencies)
+
+
+Event = Tuple[str, Tuple[Any, ...]]
+
+
+class BufferedMetricsSink:
+    """
+    Non-blocking wrapper around another sink.
+
+    record_* calls append to a bounded ring buffer in O(1) without taking a
+    lock, so they are safe to call from the event loop. A daemon thread drains
+    the buffer in batches and hands them to the wrapped sink (via its
+    record_batch() when available). When the buffer is full, ``drop_policy``
+    "drop_newest" discards the incoming event and "drop_oldest" overwrites the
+    oldest one; either way ``dropped`` is incremented.
+
+    In a child created by fork(), the sink starts over with an empty buffer
+    and its own drain thread; events buffered by the parent stay with the
+    parent.
+    """
+
+    def __init__(
+        self,
+        sink: MetricsSink,
+        capacity: int = 10_000,
+        drop_policy: str = "drop_newest",
+        batch_size: int = 512,
+        flush_interval: float = 0.05,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if drop_policy not in ("drop_newest", "drop_oldest"):
+            raise ValueError("drop_policy must be 'drop_newest' or 'drop_oldest'")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be > 0")
+
+        self.sink = sink
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        self._drop_oldest = drop_policy == "drop_oldest"
+        self._buffer: Deque[Event] = deque(
+            maxlen=capacity if self._drop_oldest else None
+        )
+        self._wake_at = max(1, capacity // 2)
+        self._wakeup = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+
+            def _after_fork_in_child() -> None:
+                buffered = ref()
+                if buffered is not None:
+                    buffered._forked()
+
+            os.register_at_fork(after_in_child=_after_fork_in_child)
+
+    # MetricsSink interface
+    def record_retry(self, key: str, attempt: int, reason: str, delay: float) -> None:
+        self._enqueue(("record_retry", (key, attempt, reason, delay)))
+
+    def record_circuit_state(self, key: str, state: str) -> None:
+        self._enqueue(("record_circuit_state", (key, state)))
+
+    def record_request_latency(self, key: str, latency: float, success: bool) -> None:
+        self._enqueue(("record_request_latency", (key, latency, success)))
+
+    def record_shed(self, key: str, priority: str, reason: str) -> None:
+        self._enqueue(("record_shed", (key, priority, reason)))
+
+    # Buffering
+    def _enqueue(self, event: Event) -> None:
+        buffer = self._buffer
+        size = len(buffer)
+        if size >= self.capacity:
+            with self._state_lock:
+                self.dropped += 1
+            if not self._drop_oldest:
+                return
+        buffer.append(event)
+        if self._thread is None:
+            self._start()
+        elif size >= self._wake_at:
+            self._wakeup.set()
+
+    def _start(self) -> None:
+        with self._state_lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="resilient-http-metrics", daemon=True
+            )
+            self._thread.start()
+
+    def _forked(self) -> None:
+        # The drain thread did not survive fork() and the locks may have been
+        # held by another thread. Events buffered before the fork are dropped:
+        # the parent still delivers them, so the child would count them twice.
+        self._buffer.clear()
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        buffer = self._buffer
+        with self._drain_lock:
+            while buffer:
+                batch: List[Event] = []
+                try:
+                    for _ in range(self.batch_size):
+                        batch.append(buffer.popleft())
+                except IndexError:
+                    pass
+                self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Event]) -> None:
+        record_batch = getattr(self.sink, "record_batch", None)
+        if record_batch is not None:
+            try:
+                record_batch(batch)
+            except Exception:
+                logger.exception("metrics sink failed to record a batch")
+            return
+        for name, args in batch:
+            # Optional events (e.g. record_shed) are skipped by sinks that
+            # only implement the MetricsSink protocol
+            method = getattr(self.sink, name, None)
+            if method is None:
+                continue
+            try:
+                method(*args)
+            except Exception:
+                logger.exception("metrics sink failed to record %s", name)
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    # Lifecycle
+    def flush(self) -> None:
+        """Deliver everything buffered so far to the wrapped sink."""
+        self._drain()
+
+    async def aflush(self) -> None:
+        """flush() in the default executor, without blocking the event loop."""
+        # Imported here so sync-only users never pay for importing asyncio
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def close(self) -> None:
+        """Stop the drain thread and flush what is left."""
+        with self._state_lock:
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    async def aclose(self) -> None:
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,323 @@
+import os
+import mmap
+import glob
+import struct
+import weakref
+import itertools
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import _STATE_FIELDS
+
+# Latency histogram upper bounds in seconds; a final +Inf bucket is implied.
+BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+COUNTERS: Tuple[str, ...] = (
+    "retries",
+    "failures",
+    "successes",
+    "open_events",
+    "half_open_events",
+    "closed_events",
+    "shed",
+)
+
+# File layout: header, then fixed-size records appended in first-seen order.
+#   header: magic, layout version, number of records in use
+#   record: key length, key bytes (UTF-8, truncated to KEY_SIZE), counters,
+#           latency sum, histogram bucket counts
+KEY_SIZE = 256
+_MAGIC = b"RHMP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+_RECORD = struct.Struct(f"<H{KEY_SIZE}s{len(COUNTERS)}Qd{len(BUCKETS) + 1}Q")
+_COUNTERS_OFFSET = struct.calcsize(f"<H{KEY_SIZE}s")
+_SUM_OFFSET = _COUNTERS_OFFSET + 8 * len(COUNTERS)
+_BUCKETS_OFFSET = _SUM_OFFSET + 8
+_U64 = struct.Struct("<Q")
+_F64 = struct.Struct("<d")
+_COUNTER_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+
+_FILE_PATTERN = "resilient_http_*.db"
+
+# Every sink owns its file: default names are "<pid>_<n>", and the sinks of
+# this process are tracked by path so two open sinks never share one.
+_instance_ids = itertools.count()
+_sinks_by_path: "weakref.WeakValueDictionary[str, MultiProcessMetricsSink]" = (
+    weakref.WeakValueDictionary()
+)
+_paths_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Files registered so far belong to the parent
+    global _paths_lock
+    _paths_lock = threading.Lock()
+    _sinks_by_path.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _encode_key(key: str) -> bytes:
+    raw = key.encode("utf-8")
+    if len(raw) > KEY_SIZE:
+        raw = raw[:KEY_SIZE].decode("utf-8", "ignore").encode("utf-8")
+    return raw
+
+
+class MultiProcessMetricsSink:
+    """
+    Metrics sink for pre-fork servers: each worker process writes fixed-layout
+    records into its own memory-mapped file in ``directory``, and
+    MultiProcessCollector merges all of them on read.
+
+    Per key it keeps the InMemoryMetricsSink counters plus a latency sum and
+    histogram (``BUCKETS``) instead of raw samples. Keys longer than
+    ``KEY_SIZE`` bytes are truncated. Point every worker at the same, initially
+    empty, directory. Each sink writes its own file, named after the pid and
+    a per-process counter unless ``worker_id`` is given (reusing a
+    ``worker_id`` resumes its file; two live sinks cannot share one). A sink
+    inherited across fork() opens a new file for the child on its next write.
+    """
+
+    def __init__(
+        self, directory: str, worker_id: Optional[str] = None, capacity: int = 64
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.directory = directory
+        self.worker_id = worker_id
+        self.initial_capacity = capacity
+        self.path = ""
+        self._lock = threading.Lock()
+        self._offsets: Dict[str, int] = {}
+        self._mmap: Optional[mmap.mmap] = None
+        self._used = 0
+        self._capacity = 0
+        self._open()
+
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+
+            def _after_fork_in_child() -> None:
+                sink = ref()
+                if sink is not None:
+                    sink._forked()
+
+            os.register_at_fork(after_in_child=_after_fork_in_child)
+
+    # File management
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        worker = self.worker_id or f"{os.getpid()}_{next(_instance_ids)}"
+        path = os.path.join(self.directory, f"resilient_http_{worker}.db")
+        with _paths_lock:
+            owner = _sinks_by_path.get(path)
+            if owner is not None and owner is not self and owner._mmap is not None:
+                raise ValueError(f"{path} is already used by another sink")
+            _sinks_by_path[path] = self
+        self.path = path
+        self._offsets = {}
+        self._used = 0
+        with open(self.path, "a+b") as f:
+            size = os.fstat(f.fileno()).st_size
+        if size >= _HEADER.size:
+            self._map(max(size, _HEADER.size + _RECORD.size))
+            assert self._mmap is not None
+            magic, version, used = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{self.path} is not a v{_VERSION} metrics file")
+            self._load_index(used)
+        else:
+            self._map(_HEADER.size + self.initial_capacity * _RECORD.size)
+            assert self._mmap is not None
+            _HEADER.pack_into(self._mmap, 0, _MAGIC, _VERSION, 0)
+
+    def _map(self, size: int) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.path, "r+b") as f:
+            if os.fstat(f.fileno()).st_size < size:
+                f.truncate(size)
+            self._mmap = mmap.mmap(f.fileno(), size)
+        self._capacity = (size - _HEADER.size) // _RECORD.size
+
+    def _load_index(self, used: int) -> None:
+        # Resume a file left by a previous process with the same worker_id
+        assert self._mmap is not None
+        for i in range(used):
+            offset = _HEADER.size + i * _RECORD.size
+            length, raw = struct.unpack_from(f"<H{KEY_SIZE}s", self._mmap, offset)
+            self._offsets[raw[:length].decode("utf-8")] = offset
+        self._used = used
+
+    def _forked(self) -> None:
+        # The parent keeps writing to the inherited file; the child starts its
+        # own, named after its pid, on the next write.
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = None
+        self.worker_id = None
+        self._lock = threading.Lock()
+
+    def _offset(self, key: str) -> int:
+        """Offset of ``key``'s record, appending one if needed; caller holds the lock."""
+        offset = self._offsets.get(key)
+        if offset is not None:
+            return offset
+        if self._used == self._capacity:
+            self._map(_HEADER.size + 2 * self._capacity * _RECORD.size)
+        assert self._mmap is not None
+        raw = _encode_key(key)
+        offset = _HEADER.size + self._used * _RECORD.size
+        struct.pack_into(f"<H{KEY_SIZE}s", self._mmap, offset, len(raw), raw)
+        # Publish the record only once its key is written
+        self._used += 1
+        _HEADER.pack_into(self._mmap, 0, _MAGIC, _VERSION, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def _increment(self, offset: int, index: int) -> None:
+        assert self._mmap is not None
+        pos = offset + _COUNTERS_OFFSET + 8 * index
+        _U64.pack_into(self._mmap, pos, _U64.unpack_from(self._mmap, pos)[0] + 1)
+
+    def _apply(self, name: str, args: Tuple[Any, ...]) -> None:
+        """Apply one event to the mapped records; caller holds the lock."""
+        if self._mmap is None:
+            self._open()
+        offset = self._offset(args[0])
+        # read after _offset(), which may have grown and remapped the file
+        mm = self._mmap
+        assert mm is not None
+        if name == "record_retry":
+            self._increment(offset, _COUNTER_INDEX["retries"])
+        elif name == "record_circuit_state":
+            state_field = _STATE_FIELDS.get(args[1])
+            if state_field:
+                self._increment(offset, _COUNTER_INDEX[state_field])
+        elif name == "record_request_latency":
+            latency, success = args[1], args[2]
+            self._increment(
+                offset, _COUNTER_INDEX["successes" if success else "failures"]
+            )
+            pos = offset + _SUM_OFFSET
+            _F64.pack_into(mm, pos, _F64.unpack_from(mm, pos)[0] + latency)
+            pos = offset + _BUCKETS_OFFSET + 8 * bisect_left(BUCKETS, latency)
+            _U64.pack_into(mm, pos, _U64.unpack_from(mm, pos)[0] + 1)
+        elif name == "record_shed":
+            self._increment(offset, _COUNTER_INDEX["shed"])
+
+    # MetricsSink interface
+    def record_batch(self, events: Iterable[Tuple[str, Tuple[Any, ...]]]) -> None:
+        with self._lock:
+            for name, args in events:
+                self._apply(name, args)
+
+    def record_retry(self, key: str, attempt: int, reason: str, delay: float) -> None:
+        with self._lock:
+            self._apply("record_retry", (key, attempt, reason, delay))
+
+    def record_circuit_state(self, key: str, state: str) -> None:
+        with self._lock:
+            self._apply("record_circuit_state", (key, state))
+
+    def record_shed(self, key: str, priority: str, reason: str) -> None:
+        with self._lock:
+            self._apply("record_shed", (key, priority, reason))
+
+    def record_request_latency(self, key: str, latency: float, success: bool) -> None:
+        with self._lock:
+            self._apply("record_request_latency", (key, latency, success))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.flush()
+                self._mmap.close()
+                self._mmap = None
+
+
+def _read_records(path: str) -> List[Tuple[str, Tuple[Any, ...]]]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        return []
+    magic, version, used = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        return []
+    records = []
+    for i in range(used):
+        offset = _HEADER.size + i * _RECORD.size
+        if offset + _RECORD.size > len(data):
+            break
+        fields = _RECORD.unpack_from(data, offset)
+        length, raw = fields[0], fields[1]
+        records.append((raw[:length].decode("utf-8", "replace"), fields[2:]))
+    return records
+
+
+class MultiProcessCollector:
+    """Merges the files written by MultiProcessMetricsSink workers in ``directory``."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, _FILE_PATTERN)))
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-key totals across all workers: the InMemoryMetricsSink counters,
+        ``latency_sum``, ``latency_count`` and cumulative ``buckets`` keyed by
+        upper bound (``float("inf")`` last).
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        n_counters = len(COUNTERS)
+        for path in self.files():
+            for key, values in _read_records(path):
+                entry = merged.get(key)
+                if entry is None:
+                    entry = merged[key] = {
+                        **{name: 0 for name in COUNTERS},
+                        "latency_sum": 0.0,
+                        "bucket_counts": [0] * (len(BUCKETS) + 1),
+                    }
+                for name, value in zip(COUNTERS, values[:n_counters]):
+                    entry[name] += value
+                entry["latency_sum"] += values[n_counters]
+                for i, value in enumerate(values[n_counters + 1 :]):
+                    entry["bucket_counts"][i] += value
+
+        for entry in merged.values():
+            counts = entry.pop("bucket_counts")
+            cumulative, running = {}, 0
+            for bound, count in zip((*BUCKETS, float("inf")), counts):
+                running += count
+                cumulative[bound] = running
+            entry["buckets"] = cumulative
+            entry["latency_count"] = running
+        return merged
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return self.collect()
+
+    def average_latency(self, key: str) -> float:
+        entry = self.collect().get(key)
+        if not entry or not entry["latency_count"]:
+            return 0.0
+        return float(entry["latency_sum"]) / entry["latency_count"]
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import zlib
+import asyncio
+import logging
+import tempfile
+from typing import Any, Dict, Optional
+
+from .circuit_breaker import CircuitBreaker
+from .metrics import InMemoryMetricsSink
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def _snapshot(
+    breaker: CircuitBreaker, metrics: Optional[InMemoryMetricsSink] = None
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "version": SNAPSHOT_VERSION,
+        # wall clock: the only time base that survives a restart
+        "taken_at": time.time(),
+        "breaker": breaker.snapshot(),
+    }
+    if metrics is not None:
+        payload["metrics"] = metrics.snapshot()
+    return payload
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+
+
+def dumps(
+    breaker: CircuitBreaker, metrics: Optional[InMemoryMetricsSink] = None
+) -> bytes:
+    """Serialize breaker (and optionally metrics) state into a compressed blob."""
+    return _encode(_snapshot(breaker, metrics))
+
+
+def loads(
+    data: bytes,
+    breaker: CircuitBreaker,
+    metrics: Optional[InMemoryMetricsSink] = None,
+    max_age: Optional[float] = None,
+) -> bool:
+    """
+    Restore state from dumps() output. Returns False (restoring nothing) when
+    the blob is from an unknown version or older than ``max_age`` seconds;
+    raises ValueError for a blob that is not a snapshot object.
+    """
+    payload = json.loads(zlib.decompress(data))
+    if not isinstance(payload, dict):
+        raise ValueError("snapshot payload is not a JSON object")
+    if payload.get("version") != SNAPSHOT_VERSION:
+        logger.warning(
+            'event="snapshot_skipped" reason="version" file_version=%s',
+            payload.get("version"),
+        )
+        return False
+
+    elapsed = max(0.0, time.time() - payload["taken_at"])
+    if max_age is not None and elapsed > max_age:
+        logger.info('event="snapshot_skipped" reason="stale" age=%.1fs', elapsed)
+        return False
+
+    breaker.restore(payload["breaker"], elapsed=elapsed)
+    if metrics is not None and "metrics" in payload:
+        metrics.restore(payload["metrics"])
+    return True
+
+
+def save(
+    path: str,
+    breaker: CircuitBreaker,
+    metrics: Optional[InMemoryMetricsSink] = None,
+) -> None:
+    """Atomically write a snapshot to ``path``."""
+    _atomic_write(path, dumps(breaker, metrics))
+
+
+def _atomic_write(path: str, blob: bytes) -> None:
+    # A unique temp file per writer, so processes checkpointing to the same
+    # path never share one; fsync before the rename makes the swap durable.
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=f".{os.path.basename(path)}."
+    )
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(blob)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _write_snapshot(path: str, payload: Dict[str, Any]) -> None:
+    _atomic_write(path, _encode(payload))
+
+
+def load(
+    path: str,
+    breaker: CircuitBreaker,
+    metrics: Optional[InMemoryMetricsSink] = None,
+    max_age: Optional[float] = None,
+) -> bool:
+    """Restore from ``path``; a missing or unreadable file is a cold start."""
+    try:
+        with open(path, "rb") as fh:
+            blob = fh.read()
+        return loads(blob, breaker, metrics, max_age=max_age)
+    except FileNotFoundError:
+        return False
+    except (
+        OSError,
+        ValueError,
+        KeyError,
+        TypeError,
+        AttributeError,
+        zlib.error,
+    ) as exc:
+        logger.warning('event="snapshot_unreadable" path="%s" error="%s"', path, exc)
+        return False
+
+
+class BreakerCheckpointer:
+    """
+    Periodically saves breaker (and metrics) state from an asyncio task.
+
+    The snapshot is taken on the event loop; encoding, compression and the
+    file write run in the default executor. A final checkpoint is written on stop().
+    """
+
+    def __init__(
+        self,
+        path: str,
+        breaker: CircuitBreaker,
+        metrics: Optional[InMemoryMetricsSink] = None,
+        interval: float = 30.0,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        self.path = path
+        self.breaker = breaker
+        self.metrics = metrics
+        self.interval = interval
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def checkpoint(self) -> None:
+        payload = _snapshot(self.breaker, self.metrics)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _write_snapshot, self.path, payload)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.checkpoint()
+            except OSError as exc:
+                logger.warning(
+                    'event="checkpoint_failed" path="%s" error="%s"', self.path, exc
+                )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.checkpoint()
+
+    async def __aenter__(self) -> "BreakerCheckpointer":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
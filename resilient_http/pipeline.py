@@ -0,0 +1,308 @@
+import time
+import asyncio
+import logging
+import functools
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .retry_policy import RetryPolicy
+from .circuit_breaker import CircuitBreaker
+from .metrics import MetricsSink
+from .exceptions import CircuitBreakerOpenError
+from .log_strategy import DEFAULT_LOG_STRATEGY, LogStrategy
+from .tracing import (
+    ATTEMPT_END,
+    ATTEMPT_START,
+    BACKOFF_END,
+    BACKOFF_START,
+    Tracer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Middleware stages, outermost first. Stages with no middleware configured are
+# simply absent from the chain.
+STAGE_RATE_LIMIT = 100
+STAGE_BULKHEAD = 200
+STAGE_BREAKER = 300
+STAGE_RETRY = 400
+STAGE_ROUTE = 450
+STAGE_HEDGE = 500
+STAGE_METRICS = 600
+
+
+@dataclass
+class RequestContext:
+    """Per-call state threaded through the middleware chain."""
+
+    method: str
+    url: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    key: str = ""
+    attempt: int = 0
+    extensions: Dict[str, Any] = field(default_factory=dict)
+    # Set by the client only while trace listeners are attached
+    tracer: Optional[Tracer] = None
+
+    def __post_init__(self) -> None:
+        if not self.key:
+            self.key = f"{self.method.upper()} {self.url}"
+
+
+Send = Callable[[RequestContext], Any]
+AsyncSend = Callable[[RequestContext], Awaitable[Any]]
+
+
+def is_failure_response(response: Any) -> bool:
+    """Server-side failures (5xx) count against breakers; client errors do not."""
+    return getattr(response, "status_code", 0) >= 500
+
+
+class Middleware:
+    """
+    Base class for pipeline stages.
+
+    Subclasses override handle() for the sync client and ahandle() for the async
+    client; both receive the context and the next callable in the chain.
+    """
+
+    stage: int = STAGE_METRICS
+
+    def handle(self, ctx: RequestContext, call_next: Send) -> Any:
+        return call_next(ctx)
+
+    async def ahandle(self, ctx: RequestContext, call_next: AsyncSend) -> Any:
+        return await call_next(ctx)
+
+
+class Pipeline:
+    """Ordered middleware chain shared by the sync and async clients."""
+
+    def __init__(self, middleware: Iterable[Middleware] = ()) -> None:
+        # sorted() is stable, so same-stage middleware keep their given order
+        self.middleware: List[Middleware] = sorted(middleware, key=lambda m: m.stage)
+
+    def bind(self, send: Send) -> Send:
+        """Compose the chain around a sync transport call, once."""
+        call = send
+        for mw in reversed(self.middleware):
+            call = functools.partial(mw.handle, call_next=call)
+        return call
+
+    def abind(self, send: AsyncSend) -> AsyncSend:
+        """Compose the chain around an async transport call, once."""
+        call = send
+        for mw in reversed(self.middleware):
+            call = functools.partial(mw.ahandle, call_next=call)
+        return call
+
+
+class CircuitBreakerMiddleware(Middleware):
+    """Checks the breaker once per logical request and records its outcome."""
+
+    stage = STAGE_BREAKER
+
+    def __init__(
+        self, breaker: CircuitBreaker, log_strategy: Optional[LogStrategy] = None
+    ) -> None:
+        self.breaker = breaker
+        self.log_strategy = log_strategy or DEFAULT_LOG_STRATEGY
+
+    def _reject(self, ctx: RequestContext) -> CircuitBreakerOpenError:
+        self.log_strategy.log(logger, logging.INFO, "cb_reject", ctx.key)
+        return CircuitBreakerOpenError(f"CircuitBreaker open for {ctx.key}")
+
+    def _record(self, ctx: RequestContext, response: Any) -> None:
+        if is_failure_response(response):
+            self.breaker.record_failure(ctx.key)
+        else:
+            self.breaker.record_success(ctx.key)
+
+    def handle(self, ctx: RequestContext, call_next: Send) -> Any:
+        if not self.breaker.allow_call(ctx.key):
+            raise self._reject(ctx)
+        try:
+            response = call_next(ctx)
+        except Exception:
+            self.breaker.record_failure(ctx.key)
+            raise
+        except BaseException:
+            # Cancelled: no outcome to record, but free a half-open probe slot
+            self.breaker.release_probe(ctx.key)
+            raise
+        self._record(ctx, response)
+        return response
+
+    async def ahandle(self, ctx: RequestContext, call_next: AsyncSend) -> Any:
+        if not self.breaker.allow_call(ctx.key):
+            raise self._reject(ctx)
+        try:
+            response = await call_next(ctx)
+        except Exception:
+            self.breaker.record_failure(ctx.key)
+            raise
+        except BaseException:
+            # Cancelled: no outcome to record, but free a half-open probe slot
+            self.breaker.release_probe(ctx.key)
+            raise
+        self._record(ctx, response)
+        return response
+
+
+class RetryMiddleware(Middleware):
+    """Re-runs the inner chain according to a RetryPolicy."""
+
+    stage = STAGE_RETRY
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        metrics: Optional[MetricsSink] = None,
+        on_retry: Optional[Callable[[int, Any], None]] = None,
+        log_strategy: Optional[LogStrategy] = None,
+    ) -> None:
+        self.policy = policy
+        self.metrics = metrics
+        self.on_retry = on_retry
+        self.log_strategy = log_strategy or DEFAULT_LOG_STRATEGY
+
+    def _notify(
+        self, ctx: RequestContext, reason: str, delay: float, outcome: Any
+    ) -> None:
+        self.log_strategy.log(
+            logger,
+            logging.DEBUG,
+            "retry",
+            ctx.key,
+            url=ctx.url,
+            attempt=ctx.attempt,
+            delay=delay,
+            reason=reason,
+        )
+        if self.metrics:
+            self.metrics.record_retry(ctx.key, ctx.attempt, reason, delay)
+        if callable(self.on_retry):
+            self.on_retry(ctx.attempt, outcome)
+
+    def handle(self, ctx: RequestContext, call_next: Send) -> Any:
+        decide = self.policy.decide
+        tracer = ctx.tracer
+        attempt = 0
+        while True:
+            ctx.attempt = attempt
+            if tracer is not None:
+                tracer.emit(ATTEMPT_START, ctx)
+            try:
+                response = call_next(ctx)
+            except Exception as exc:
+                if tracer is not None:
+                    tracer.emit(ATTEMPT_END, ctx, exc)
+                decision = decide(ctx.method, attempt, exc=exc)
+                if not decision.retry:
+                    raise
+                self._notify(ctx, decision.reason, decision.delay, exc)
+            else:
+                if tracer is not None:
+                    tracer.emit(ATTEMPT_END, ctx, response)
+                decision = decide(ctx.method, attempt, status=response.status_code)
+                if not decision.retry:
+                    return response
+                self._notify(ctx, decision.reason, decision.delay, response)
+            if tracer is not None:
+                tracer.emit(BACKOFF_START, ctx, decision.delay)
+                time.sleep(decision.delay)
+                tracer.emit(BACKOFF_END, ctx)
+            else:
+                time.sleep(decision.delay)
+            attempt += 1
+
+    async def ahandle(self, ctx: RequestContext, call_next: AsyncSend) -> Any:
+        decide = self.policy.decide
+        tracer = ctx.tracer
+        attempt = 0
+        while True:
+            ctx.attempt = attempt
+            if tracer is not None:
+                tracer.emit(ATTEMPT_START, ctx)
+            try:
+                response = await call_next(ctx)
+            except Exception as exc:
+                if tracer is not None:
+                    tracer.emit(ATTEMPT_END, ctx, exc)
+                decision = decide(ctx.method, attempt, exc=exc)
+                if not decision.retry:
+                    raise
+                self._notify(ctx, decision.reason, decision.delay, exc)
+            else:
+                if tracer is not None:
+                    tracer.emit(ATTEMPT_END, ctx, response)
+                decision = decide(ctx.method, attempt, status=response.status_code)
+                if not decision.retry:
+                    return response
+                self._notify(ctx, decision.reason, decision.delay, response)
+            if tracer is not None:
+                tracer.emit(BACKOFF_START, ctx, decision.delay)
+                await asyncio.sleep(decision.delay)
+                tracer.emit(BACKOFF_END, ctx)
+            else:
+                await asyncio.sleep(decision.delay)
+            attempt += 1
+
+
+class MetricsMiddleware(Middleware):
+    """Times every attempt and reports it to the metrics sink."""
+
+    stage = STAGE_METRICS
+
+    def __init__(self, metrics: MetricsSink) -> None:
+        self.metrics = metrics
+
+    def handle(self, ctx: RequestContext, call_next: Send) -> Any:
+        start = time.perf_counter()
+        try:
+            response = call_next(ctx)
+        except Exception:
+            self.metrics.record_request_latency(
+                ctx.key, time.perf_counter() - start, False
+            )
+            raise
+        self.metrics.record_request_latency(
+            ctx.key, time.perf_counter() - start, not is_failure_response(response)
+        )
+        return response
+
+    async def ahandle(self, ctx: RequestContext, call_next: AsyncSend) -> Any:
+        start = time.perf_counter()
+        try:
+            response = await call_next(ctx)
+        except Exception:
+            self.metrics.record_request_latency(
+                ctx.key, time.perf_counter() - start, False
+            )
+            raise
+        self.metrics.record_request_latency(
+            ctx.key, time.perf_counter() - start, not is_failure_response(response)
+        )
+        return response
+
+
+def build_pipeline(
+    retry_policy: RetryPolicy,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    metrics: Optional[MetricsSink] = None,
+    on_retry: Optional[Callable[[int, Any], None]] = None,
+    middleware: Iterable[Middleware] = (),
+    log_strategy: Optional[LogStrategy] = None,
+) -> Pipeline:
+    """Standard chain used by both clients plus any user-supplied middleware."""
+    stages = list(middleware)
+    if circuit_breaker is not None:
+        stages.append(CircuitBreakerMiddleware(circuit_breaker, log_strategy))
+    stages.append(
+        RetryMiddleware(
+            retry_policy, metrics=metrics, on_retry=on_retry, log_strategy=log_strategy
+        )
+    )
+    if metrics is not None:
+        stages.append(MetricsMiddleware(metrics))
+    return Pipeline(stages)
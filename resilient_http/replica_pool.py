@@ -0,0 +1,248 @@
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Set
+
+from .circuit_breaker import CircuitBreaker
+from .pipeline import (
+    STAGE_ROUTE,
+    AsyncSend,
+    Middleware,
+    RequestContext,
+    Send,
+    is_failure_response,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Replica:
+    """One upstream endpoint and its load / health statistics."""
+
+    base_url: str
+    in_flight: int = 0
+    ewma_latency: float = 0.0
+    window_requests: int = 0
+    window_failures: int = 0
+
+    def url_for(self, path: str) -> str:
+        if not path:
+            return self.base_url
+        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+
+
+class ReplicaPool:
+    """
+    Load balancer over several base URLs of the same service.
+
+    Picks replicas with power-of-two-choices on (in_flight + 1) * EWMA latency
+    and ejects outliers Envoy-style through a CircuitBreaker keyed by base URL:
+
+    - consecutive failures open the replica's circuit directly;
+    - every ``interval`` seconds, replicas with at least ``min_requests`` in the
+      window are ejected when their failure rate exceeds
+      ``failure_rate_threshold`` or their EWMA latency exceeds
+      ``latency_factor`` times the pool median.
+
+    Ejected replicas come back through the breaker's half-open probe. At most
+    ``max_ejection_percent`` of the pool is ejected by outlier analysis, and if
+    every replica is unavailable the pool picks from all of them (panic mode).
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[str],
+        breaker: Optional[CircuitBreaker] = None,
+        consecutive_failures: int = 5,
+        ejection_time: float = 30.0,
+        ewma_alpha: float = 0.3,
+        interval: float = 10.0,
+        min_requests: int = 20,
+        failure_rate_threshold: float = 0.5,
+        latency_factor: float = 3.0,
+        max_ejection_percent: float = 50.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("endpoints cannot be empty")
+        if not 0 < ewma_alpha <= 1:
+            raise ValueError("ewma_alpha must be in (0, 1]")
+        if not 0 <= max_ejection_percent <= 100:
+            raise ValueError("max_ejection_percent must be in [0, 100]")
+
+        self.replicas: List[Replica] = [Replica(url) for url in endpoints]
+        # Identifies the pool where a single key stands for all its replicas,
+        # e.g. the load-shedding budget of requests routed through it
+        self.name = name or f"replica-pool-{id(self):x}"
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=consecutive_failures, recovery_timeout=ejection_time
+        )
+        self.ewma_alpha = ewma_alpha
+        self.interval = interval
+        self.min_requests = min_requests
+        self.failure_rate_threshold = failure_rate_threshold
+        self.latency_factor = latency_factor
+        self.max_ejection_percent = max_ejection_percent
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._last_analysis = clock()
+
+    # Selection
+    def _score(self, replica: Replica) -> float:
+        return (replica.in_flight + 1) * replica.ewma_latency
+
+    def _p2c(self, candidates: List[Replica]) -> Replica:
+        if len(candidates) == 1:
+            return candidates[0]
+        a, b = self._rng.sample(candidates, 2)
+        return a if self._score(a) <= self._score(b) else b
+
+    def acquire(self, exclude: Optional[Set[str]] = None) -> Replica:
+        """Pick a replica, preferring ones not in ``exclude``, and mark it in flight."""
+        exclude = exclude or set()
+        with self._lock:
+            available = [
+                r for r in self.replicas if self.breaker.state(r.base_url) != "open"
+            ]
+            fresh = [r for r in available if r.base_url not in exclude]
+            candidates = fresh or available
+            while candidates:
+                replica = self._p2c(candidates)
+                # claims the half-open probe slot for recovering replicas
+                if self.breaker.allow_call(replica.base_url):
+                    break
+                candidates.remove(replica)
+            else:
+                self.breaker.log_strategy.log(
+                    logger,
+                    logging.INFO,
+                    "replica_pool_panic",
+                    "*",
+                    reason="all_ejected",
+                )
+                replica = self._p2c(
+                    [r for r in self.replicas if r.base_url not in exclude]
+                    or self.replicas
+                )
+            replica.in_flight += 1
+            return replica
+
+    def release(self, replica: Replica, latency: float, failed: Optional[bool]) -> None:
+        """
+        Record the outcome of a call routed to ``replica``; ``failed=None``
+        (e.g. a cancelled call) only releases its in-flight slot and, for a
+        recovering replica, its half-open probe slot.
+        """
+        with self._lock:
+            replica.in_flight -= 1
+            if failed is None:
+                self.breaker.release_probe(replica.base_url)
+                return
+            if replica.ewma_latency == 0.0:
+                replica.ewma_latency = latency
+            else:
+                replica.ewma_latency += self.ewma_alpha * (
+                    latency - replica.ewma_latency
+                )
+            replica.window_requests += 1
+            if failed:
+                replica.window_failures += 1
+                self.breaker.record_failure(replica.base_url)
+            else:
+                self.breaker.record_success(replica.base_url)
+
+            if self._clock() - self._last_analysis >= self.interval:
+                self._analyze()
+
+    # Outlier detection
+    def _analyze(self) -> None:
+        self._last_analysis = self._clock()
+        max_ejected = int(len(self.replicas) * self.max_ejection_percent / 100)
+        ejected = sum(
+            1 for r in self.replicas if self.breaker.state(r.base_url) == "open"
+        )
+
+        latencies = sorted(r.ewma_latency for r in self.replicas if r.ewma_latency)
+        median = latencies[len(latencies) // 2] if latencies else 0.0
+
+        for replica in self.replicas:
+            requests, failures = replica.window_requests, replica.window_failures
+            replica.window_requests = replica.window_failures = 0
+            if requests < self.min_requests or ejected >= max_ejected:
+                continue
+            if self.breaker.state(replica.base_url) == "open":
+                continue
+
+            reason = None
+            if failures / requests > self.failure_rate_threshold:
+                reason = "failure_rate"
+            elif (
+                len(latencies) > 2
+                and median > 0
+                and replica.ewma_latency > self.latency_factor * median
+            ):
+                reason = "latency"
+
+            if reason:
+                self.breaker.log_strategy.log(
+                    logger,
+                    logging.INFO,
+                    "replica_ejected",
+                    replica.base_url,
+                    reason=reason,
+                    requests=requests,
+                    failures=failures,
+                )
+                self.breaker.trip(replica.base_url)
+                ejected += 1
+
+
+class ReplicaPoolMiddleware(Middleware):
+    """Routes each attempt to a replica, moving retries onto untried replicas."""
+
+    stage = STAGE_ROUTE
+
+    def __init__(self, pool: ReplicaPool) -> None:
+        self.pool = pool
+
+    def _route(self, ctx: RequestContext) -> Replica:
+        path = ctx.extensions.setdefault("replica_path", ctx.url)
+        tried: Set[str] = ctx.extensions.setdefault("replicas_tried", set())
+        replica = self.pool.acquire(exclude=tried)
+        tried.add(replica.base_url)
+        ctx.url = replica.url_for(path)
+        return replica
+
+    def handle(self, ctx: RequestContext, call_next: Send) -> Any:
+        replica = self._route(ctx)
+        start = time.perf_counter()
+        failed: Optional[bool] = None
+        try:
+            response = call_next(ctx)
+            failed = is_failure_response(response)
+            return response
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.pool.release(replica, time.perf_counter() - start, failed)
+
+    async def ahandle(self, ctx: RequestContext, call_next: AsyncSend) -> Any:
+        replica = self._route(ctx)
+        start = time.perf_counter()
+        failed: Optional[bool] = None
+        try:
+            response = await call_next(ctx)
+            failed = is_failure_response(response)
+            return response
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.pool.release(replica, time.perf_counter() - start, failed)
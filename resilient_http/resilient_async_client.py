@@ -1,16 +1,32 @@
-import time
-import asyncio
 import logging
 import httpx
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, Iterable, Sequence, Union
 
 from .retry_policy import RetryPolicy
 from .circuit_breaker import CircuitBreaker
 from .metrics import MetricsSink
-from .exceptions import CircuitBreakerOpenError
+from .pipeline import Middleware, RequestContext, build_pipeline
+from .replica_pool import ReplicaPool, ReplicaPoolMiddleware
+from .load_shedding import LoadSheddingMiddleware, PriorityScheduler
+from .sharding import ClientShards, resolve_http2
+from .log_strategy import DEFAULT_LOG_STRATEGY, LogStrategy
+from .tracing import CONNECTION_ACQUIRED, RESPONSE_HEADERS, Tracer, atraced_call
 
 logger = logging.getLogger(__name__)
 
+# Attributes the middleware chain is built from
+_PIPELINE_ATTRS = frozenset(
+    {
+        "retry_policy",
+        "circuit_breaker",
+        "metrics",
+        "on_retry",
+        "log_strategy",
+        "replica_pool",
+        "scheduler",
+    }
+)
+
 
 class ResilientAsyncClient:
     def __init__(
@@ -20,12 +36,66 @@ class ResilientAsyncClient:
         circuit_breaker: Optional[CircuitBreaker] = None,
         metrics: Optional[MetricsSink] = None,
         on_retry: Optional[Callable[[int, Any], None]] = None,
+        middleware: Iterable[Middleware] = (),
+        replicas: Optional[Union[Sequence[str], ReplicaPool]] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        tracer: Optional[Tracer] = None,
+        log_strategy: Optional[LogStrategy] = None,
+        http2: bool = False,
+        shards: Optional[ClientShards] = None,
     ):
-        self.client = client or httpx.AsyncClient()
+        # http2 only applies to the client created here; ``shards`` route
+        # selected hosts to dedicated (optionally HTTP/2) clients.
+        self.client = client or httpx.AsyncClient(http2=resolve_http2(http2))
+        self.shards = shards
+        if shards is not None:
+            shards.bind(self.client)
         self.retry_policy = retry_policy or RetryPolicy()
-        self.circuit_breaker = circuit_breaker or CircuitBreaker(metrics=metrics)
+        log_strategy = log_strategy or DEFAULT_LOG_STRATEGY
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            metrics=metrics, log_strategy=log_strategy
+        )
         self.metrics = metrics
         self.on_retry = on_retry
+        self.log_strategy = log_strategy
+        self.replica_pool: Optional[ReplicaPool] = None
+        if replicas is not None:
+            self.replica_pool = (
+                replicas if isinstance(replicas, ReplicaPool) else ReplicaPool(replicas)
+            )
+        self.scheduler = scheduler
+        self.tracer = tracer or Tracer()
+        self._middleware = list(middleware)
+        self._build_pipeline()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # The chain captures these when built; rebuild so reassignment applies
+        if name in _PIPELINE_ATTRS and "_call" in self.__dict__:
+            self._build_pipeline()
+
+    def _build_pipeline(self) -> None:
+        middleware = list(self._middleware)
+        if self.replica_pool is not None:
+            middleware.append(ReplicaPoolMiddleware(self.replica_pool))
+        if self.scheduler is not None:
+            middleware.append(
+                LoadSheddingMiddleware(
+                    self.scheduler,
+                    self.metrics,
+                    self.log_strategy,
+                    default_key=self.replica_pool.name if self.replica_pool else "",
+                )
+            )
+        self.pipeline = build_pipeline(
+            self.retry_policy,
+            self.circuit_breaker,
+            self.metrics,
+            self.on_retry,
+            middleware,
+            log_strategy=self.log_strategy,
+        )
+        self._call = self.pipeline.abind(self._send)
 
     async def __aenter__(self):
         return self
@@ -33,70 +103,53 @@ class ResilientAsyncClient:
     async def __aexit__(self, exc_type, exc, tb):
         if hasattr(self.client, "aclose"):
             await self.client.aclose()
-
-    async def request(self, method: str, url: str, **kwargs):
-        key = f"{method.upper()} {url}"
-
-        if not self.circuit_breaker.allow_call(key):
-            logger.info(f"Circuit open — skipping async call {key}")
-            if self.metrics:
-                self.metrics.record_circuit_state(key, "open")
-            raise CircuitBreakerOpenError(f"CircuitBreaker open for {key}")
-
-        for attempt in range(self.retry_policy.max_attempts):
-            start = time.perf_counter()
-            try:
-                response = await self.client.request(method, url, **kwargs)
-                latency = time.perf_counter() - start
-                if self.metrics:
-                    self.metrics.record_request_latency(key, latency, True)
-
-                # Retry based on status code
-                if response.status_code >= 400:
-                    if self.retry_policy.should_retry(
-                        method, attempt, status=response.status_code
-                    ):
-                        delay = self.retry_policy.next_delay(attempt)
-                        logger.debug(
-                            f"event='retry' url='{url}' attempt={attempt} delay={delay:.2f}s reason='status_{response.status_code}'"
-                        )
-                        if self.metrics:
-                            self.metrics.record_retry(
-                                key, attempt, f"status_{response.status_code}", delay
-                            )
-                        if callable(self.on_retry):
-                            self.on_retry(attempt, response)
-                        await asyncio.sleep(delay)
-                        continue
-
-                self.circuit_breaker.record_success(key)
-                return response
-
-            except Exception as exc:
-                latency = time.perf_counter() - start
-                if self.metrics:
-                    self.metrics.record_request_latency(key, latency, False)
-
-                should_retry, delay = self.retry_policy.should_retry_exception(
-                    exc, attempt
-                )
-                if not should_retry:
-                    self.circuit_breaker.record_failure(key)
-                    raise
-
-                logger.debug(
-                    f"event='retry' url='{url}' attempt={attempt} delay={delay:.2f}s reason='{exc.__class__.__name__}'"
-                )
-                if self.metrics:
-                    self.metrics.record_retry(
-                        key, attempt, exc.__class__.__name__, delay
-                    )
-                if callable(self.on_retry):
-                    self.on_retry(attempt, exc)
-                await asyncio.sleep(delay)
-
-        self.circuit_breaker.record_failure(key)
-        raise RuntimeError(f"All async retry attempts failed for {key}")
+        if self.shards is not None:
+            await self.shards.aclose()
+        await self._flush_metrics()
+
+    async def _flush_metrics(self) -> None:
+        # Buffered sinks deliver pending events off the event loop
+        aflush = getattr(self.metrics, "aflush", None)
+        if aflush is not None:
+            await aflush()
+
+    @staticmethod
+    def _with_trace_extension(ctx: RequestContext) -> Dict[str, Any]:
+        # httpcore reports connection and HTTP/1.1 / HTTP/2 progress through
+        # the "trace" request extension; sending headers is the first step
+        # once a pooled connection has been acquired (or connected).
+        tracer = ctx.tracer
+        assert tracer is not None
+        extensions = dict(ctx.kwargs.get("extensions") or {})
+        user_trace = extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name.endswith(".send_request_headers.started"):
+                tracer.emit(CONNECTION_ACQUIRED, ctx)
+            elif event_name.endswith(".receive_response_headers.complete"):
+                tracer.emit(RESPONSE_HEADERS, ctx)
+            if user_trace is not None:
+                await user_trace(event_name, info)
+
+        extensions["trace"] = trace
+        return {**ctx.kwargs, "extensions": extensions}
+
+    async def _send(self, ctx: RequestContext) -> httpx.Response:
+        kwargs = ctx.kwargs if ctx.tracer is None else self._with_trace_extension(ctx)
+        client = self.client
+        if self.shards is not None:
+            client = self.shards.client_for(ctx.url) or client
+        return await client.request(ctx.method, ctx.url, **kwargs)
+
+    async def request(
+        self, method: str, url: str, *, priority: Optional[int] = None, **kwargs
+    ):
+        ctx = RequestContext(method, url, kwargs)
+        if priority is not None:
+            ctx.extensions["priority"] = priority
+        if self.tracer.listeners:
+            return await atraced_call(self.tracer, ctx, self._call)
+        return await self._call(ctx)
 
     async def get(self, url: str, **kwargs) -> httpx.Response:
         return await self.request("GET", url, **kwargs)
@@ -106,3 +159,6 @@ class ResilientAsyncClient:
 
     async def close(self):
         await self.client.aclose()
+        if self.shards is not None:
+            await self.shards.aclose()
+        await self._flush_metrics()
@@ -1,13 +1,29 @@
 import logging
-import time
 import requests
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, Iterable, Sequence, Union
 from .retry_policy import RetryPolicy
 from .circuit_breaker import CircuitBreaker
 from .metrics import MetricsSink
-
+from .pipeline import Middleware, RequestContext, build_pipeline
+from .replica_pool import ReplicaPool, ReplicaPoolMiddleware
+from .load_shedding import LoadSheddingMiddleware, PriorityScheduler
+from .log_strategy import DEFAULT_LOG_STRATEGY, LogStrategy
+from .tracing import RESPONSE_HEADERS, Tracer, traced_call
 
 logger = logging.getLogger(__name__)
+
+# Attributes the middleware chain is built from
+_PIPELINE_ATTRS = frozenset(
+    {
+        "retry_policy",
+        "cb",
+        "metrics",
+        "on_retry",
+        "log_strategy",
+        "replica_pool",
+        "scheduler",
+    }
+)
 metrics: Optional[MetricsSink] = None
 
 
@@ -20,74 +36,100 @@ class ResilientRequestsSession:
         retry_policy: Optional[RetryPolicy] = None,
         circuit_breaker: Optional[CircuitBreaker] = None,
         on_retry: Optional[Callable[[int, Any], None]] = None,
+        metrics: Optional[MetricsSink] = None,
+        middleware: Iterable[Middleware] = (),
+        replicas: Optional[Union[Sequence[str], ReplicaPool]] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        tracer: Optional[Tracer] = None,
+        log_strategy: Optional[LogStrategy] = None,
     ) -> None:
+        if metrics is None:
+            # Fall back to the module-level default sink
+            metrics = globals()["metrics"]
         self.session = session or requests.Session()
         self.retry_policy = retry_policy or RetryPolicy()
-        self.cb = circuit_breaker or CircuitBreaker()
+        log_strategy = log_strategy or DEFAULT_LOG_STRATEGY
+        self.cb = circuit_breaker or CircuitBreaker(
+            metrics=metrics, log_strategy=log_strategy
+        )
         self.on_retry = on_retry
+        self.log_strategy = log_strategy
         self.metrics = metrics
-
-    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
-        """Perform an HTTP request with retries and circuit breaker handling."""
-        key = f"{method.upper()} {url}"
-        attempt = 0
-
-        while True:
-            if not self.cb.allow_call(key):
-                raise RuntimeError(f"Circuit open for {key}")
-
-            try:
-                response = self.session.request(method, url, **kwargs)
-            except Exception as exc:
-                should, delay = self.retry_policy.should_retry_exception(exc, attempt)
-                if not should:
-                    self.cb.record_failure(key)
-                    raise
-
-                # Logging retry
-                logger.debug(
-                    f'event="retry" url="{url}" method="{method}" '
-                    f"attempt={attempt} delay={delay:.3f}s reason={exc.__class__.__name__}"
-                )
-
-                if callable(self.on_retry):
-                    self.on_retry(attempt, exc)
-
-                time.sleep(delay)
-                attempt += 1
-                continue
-
-            # Success path
-            if response.status_code < 400:
-                self.cb.record_success(key)
-                if self.metrics:
-                    self.metrics.record_request_latency(key, 0.0, True)
-                return response
-
-            # Retry path on HTTP error
-            if self.retry_policy.should_retry(
-                method, attempt, status=response.status_code
-            ):
-                delay = self.retry_policy.next_delay(attempt)
-
-                logger.debug(
-                    f'event="retry" url="{url}" method="{method}" '
-                    f"attempt={attempt} delay={delay:.3f}s reason=status_{response.status_code}"
+        self.replica_pool: Optional[ReplicaPool] = None
+        if replicas is not None:
+            self.replica_pool = (
+                replicas if isinstance(replicas, ReplicaPool) else ReplicaPool(replicas)
+            )
+        self.scheduler = scheduler
+        self.tracer = tracer or Tracer()
+        self._middleware = list(middleware)
+        self._build_pipeline()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # The chain captures these when built; rebuild so reassignment applies
+        if name in _PIPELINE_ATTRS and "_call" in self.__dict__:
+            self._build_pipeline()
+
+    def _build_pipeline(self) -> None:
+        middleware = list(self._middleware)
+        if self.replica_pool is not None:
+            middleware.append(ReplicaPoolMiddleware(self.replica_pool))
+        if self.scheduler is not None:
+            middleware.append(
+                LoadSheddingMiddleware(
+                    self.scheduler,
+                    self.metrics,
+                    self.log_strategy,
+                    default_key=self.replica_pool.name if self.replica_pool else "",
                 )
-
-                if callable(self.on_retry):
-                    self.on_retry(attempt, response)
-
-                time.sleep(delay)
-                attempt += 1
-                continue
-
-            # Failure (no retry)
-            if self.metrics:
-                self.metrics.record_request_latency(key, 0.0, False)
-
-            self.cb.record_failure(key)
-            return response
+            )
+        self.pipeline = build_pipeline(
+            self.retry_policy,
+            self.cb,
+            self.metrics,
+            self.on_retry,
+            middleware,
+            log_strategy=self.log_strategy,
+        )
+        self._call = self.pipeline.bind(self._send)
+
+    def _with_trace_hook(self, ctx: RequestContext) -> Dict[str, Any]:
+        # requests runs response hooks before reading the body, which is as
+        # close to "headers received" as it exposes. It has no hook for
+        # connection pool checkout, so connection_acquired is not emitted.
+        tracer = ctx.tracer
+        assert tracer is not None
+
+        def on_headers(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+            tracer.emit(RESPONSE_HEADERS, ctx)
+
+        hooks = dict(ctx.kwargs.get("hooks") or {})
+        # A per-request "response" hook replaces the session's, so carry those over
+        existing = hooks.get("response", self.session.hooks.get("response", []))
+        if callable(existing):
+            existing = [existing]
+        hooks["response"] = [on_headers, *existing]
+        return {**ctx.kwargs, "hooks": hooks}
+
+    def _send(self, ctx: RequestContext) -> requests.Response:
+        kwargs = ctx.kwargs if ctx.tracer is None else self._with_trace_hook(ctx)
+        return self.session.request(ctx.method, ctx.url, **kwargs)
+
+    def request(
+        self, method: str, url: str, *, priority: Optional[int] = None, **kwargs: Any
+    ) -> requests.Response:
+        """Perform an HTTP request with retries and circuit breaker handling.
+
+        ``priority`` (see load_shedding.Priority) orders admission when a
+        scheduler is configured.
+        """
+        ctx = RequestContext(method, url, kwargs)
+        if priority is not None:
+            ctx.extensions["priority"] = priority
+        if self.tracer.listeners:
+            return traced_call(self.tracer, ctx, self._call)
+        return self._call(ctx)
 
     # Convenience wrappers
     def get(self, url: str, **kwargs: Any) -> requests.Response:
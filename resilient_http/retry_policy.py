@@ -1,20 +1,166 @@
+import sys
 from dataclasses import dataclass, field
-from typing import Iterable, Set, Callable, Type, Optional, Tuple
-from requests import Timeout, ConnectionError as RequestsConnectionError
-from httpx import ConnectError as HttpxConnectError, ReadTimeout as HttpxTimeout
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+# Backend module -> exception class names retried by default. Resolved lazily so
+# that this module never imports requests or httpx itself.
+_DEFAULT_RETRY_EXCEPTIONS: Dict[str, Tuple[str, ...]] = {
+    "requests": ("Timeout", "ConnectionError"),
+    "httpx": ("ConnectError", "ReadTimeout"),
+}
+
+
+def default_retry_exceptions() -> Tuple[Type[BaseException], ...]:
+    """
+    Default retryable exception classes for the HTTP backends imported so far.
+
+    A backend's exceptions can only be raised once that backend is loaded, so
+    only modules already present in sys.modules are consulted.
+    """
+    found: List[Type[BaseException]] = []
+    for module_name, names in _DEFAULT_RETRY_EXCEPTIONS.items():
+        module = sys.modules.get(module_name)
+        if module is not None:
+            found.extend(getattr(module, name) for name in names)
+    return tuple(found)
+
+
+class _BackendRetryExceptions:
+    """Lazy default for RetryPolicy.retry_on_exceptions."""
+
+    def __iter__(self) -> Iterator[Type[BaseException]]:
+        return iter(default_retry_exceptions())
+
+    def __repr__(self) -> str:
+        return "<default backend retry exceptions>"
+
+
+class RetryDecision(NamedTuple):
+    """Outcome of RetryPolicy.decide: whether to retry, how long to wait, and why."""
+
+    retry: bool
+    delay: float
+    reason: str
+
+
+# Status codes covered by the precompiled lookup array; anything outside falls
+# back to plain set membership.
+_STATUS_TABLE_SIZE = 600
+_STATUS_REASONS = tuple(f"status_{code}" for code in range(_STATUS_TABLE_SIZE))
+
+_ATTEMPTS_EXHAUSTED = RetryDecision(False, 0.0, "attempts_exhausted")
+_METHOD_NOT_RETRYABLE = RetryDecision(False, 0.0, "method_not_retryable")
+_NOTHING_TO_RETRY = RetryDecision(False, 0.0, "no_retry_condition")
+
+_WATCHED_SETS = frozenset({"retry_on_status", "retry_on_methods", "give_up_on_status"})
+_COMPILED_FIELDS = _WATCHED_SETS | {"max_attempts", "retry_on_exceptions"}
+
+
+class _WatchedSet(set):
+    """set that invalidates its owning policy's compiled tables on mutation."""
+
+    __slots__ = ("_on_change",)
+
+    def __init__(self, items: Iterable[Any], on_change: Callable[[], None]) -> None:
+        super().__init__(items)
+        self._on_change = on_change
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+    def __reduce__(self) -> Any:
+        return (set, (list(self),))
+
+
+def _watched(method_name: str) -> Callable[..., Any]:
+    base = getattr(set, method_name)
+
+    def _fn(self: _WatchedSet, *args: Any) -> Any:
+        result = base(self, *args)
+        self._on_change()
+        return result
+
+    _fn.__name__ = method_name
+    return _fn
+
+
+for _name in (
+    "add",
+    "discard",
+    "remove",
+    "pop",
+    "clear",
+    "update",
+    "difference_update",
+    "intersection_update",
+    "symmetric_difference_update",
+    "__ior__",
+    "__iand__",
+    "__isub__",
+    "__ixor__",
+):
+    setattr(_WatchedSet, _name, _watched(_name))
+
+
+class _CompiledPolicy:
+    """Decision tables derived from a RetryPolicy's configuration."""
+
+    __slots__ = ("last_attempt", "statuses", "methods", "exc_types", "exc_cache")
+
+    def __init__(self, policy: "RetryPolicy") -> None:
+        self.last_attempt = policy.max_attempts - 1
+
+        statuses = bytearray(_STATUS_TABLE_SIZE)
+        for code in policy.retry_on_status:
+            if 0 <= code < _STATUS_TABLE_SIZE and code not in policy.give_up_on_status:
+                statuses[code] = 1
+        self.statuses = bytes(statuses)
+
+        # Interned flags for the methods we expect to see; unknown spellings
+        # are resolved once and cached by RetryPolicy._method_allowed.
+        self.methods: Dict[str, bool] = {}
+        for method in policy.retry_on_methods:
+            self.methods[method] = True
+            self.methods[method.lower()] = True
+
+        # None means "defaults of whichever backends are loaded", resolved on
+        # each exception-class cache miss.
+        self.exc_types: Optional[Tuple[Type[BaseException], ...]] = (
+            None
+            if isinstance(policy.retry_on_exceptions, _BackendRetryExceptions)
+            else tuple(policy.retry_on_exceptions)
+        )
+        self.exc_cache: Dict[type, bool] = {}
 
 
 @dataclass
 class RetryPolicy:
-    """Configurable retry strategy with backoff and status/exception rules."""
+    """
+    Configurable retry strategy with backoff and status/exception rules.
+
+    The rules are compiled into lookup tables when the policy is built and
+    recompiled lazily whenever a rule field is reassigned or one of its sets is
+    mutated in place. The policy keeps its own copies of the status and method
+    sets; after mutating a custom retry_on_exceptions sequence in place, call
+    compile().
+    """
 
     max_attempts: int = 3
     retry_on_status: Set[int] = field(default_factory=lambda: {429, 500, 502, 503, 504})
-    retry_on_exceptions: Iterable[Type[BaseException]] = (
-        Timeout,
-        RequestsConnectionError,
-        HttpxConnectError,
-        HttpxTimeout,
+    retry_on_exceptions: Iterable[Type[BaseException]] = field(
+        default_factory=_BackendRetryExceptions
     )
     retry_on_methods: Set[str] = field(
         default_factory=lambda: {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
@@ -31,6 +177,23 @@ class RetryPolicy:
             self.backoff = full_jitter(exp)
 
         self.validate()
+        self.compile()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _WATCHED_SETS and isinstance(value, set):
+            value = _WatchedSet(value, self._invalidate)
+        object.__setattr__(self, name, value)
+        if name in _COMPILED_FIELDS:
+            object.__setattr__(self, "_compiled", None)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Route copies through __setattr__ so the sets stay watched.
+        for name, value in state.items():
+            if name != "_compiled":
+                setattr(self, name, value)
+
+    def _invalidate(self) -> None:
+        object.__setattr__(self, "_compiled", None)
 
     # Validation
     def validate(self) -> None:
@@ -50,7 +213,80 @@ class RetryPolicy:
                 f"Status codes present in both retry_on_status and give_up_on_status: {conflict}"
             )
 
+    # Compilation
+    def compile(self) -> None:
+        """(Re)build the precompiled decision tables from the current rules."""
+        object.__setattr__(self, "_compiled", _CompiledPolicy(self))
+
+    def _tables(self) -> _CompiledPolicy:
+        compiled: Optional[_CompiledPolicy] = self.__dict__.get("_compiled")
+        if compiled is None:
+            compiled = _CompiledPolicy(self)
+            object.__setattr__(self, "_compiled", compiled)
+        return compiled
+
+    def _method_allowed(self, tables: _CompiledPolicy, method: str) -> bool:
+        allowed = tables.methods.get(method)
+        if allowed is None:
+            allowed = method.upper() in self.retry_on_methods
+            tables.methods[method] = allowed
+        return allowed
+
+    def _status_retryable(self, tables: _CompiledPolicy, status: int) -> bool:
+        if 0 <= status < _STATUS_TABLE_SIZE:
+            return tables.statuses[status] == 1
+        return status in self.retry_on_status and status not in self.give_up_on_status
+
+    def _exception_retryable(self, tables: _CompiledPolicy, exc: BaseException) -> bool:
+        cls = type(exc)
+        retryable = tables.exc_cache.get(cls)
+        if retryable is None:
+            types = tables.exc_types
+            if types is None:
+                types = default_retry_exceptions()
+            retryable = issubclass(cls, types)
+            tables.exc_cache[cls] = retryable
+        return retryable
+
     # Retry decision
+    def decide(
+        self,
+        method: str,
+        attempt: int,
+        *,
+        status: Optional[int] = None,
+        exc: Optional[BaseException] = None,
+    ) -> RetryDecision:
+        """
+        Single-call retry decision for a response status or exception.
+
+        Returns RetryDecision(retry, delay, reason). Exceptions are retried
+        regardless of method, matching should_retry_exception.
+        """
+        tables = self._tables()
+        if attempt >= tables.last_attempt:
+            return _ATTEMPTS_EXHAUSTED
+
+        if exc is not None:
+            reason = exc.__class__.__name__
+            if not self._exception_retryable(tables, exc):
+                return RetryDecision(False, 0.0, reason)
+            return RetryDecision(True, self.next_delay(attempt), reason)
+
+        if status is None:
+            return _NOTHING_TO_RETRY
+        if not self._method_allowed(tables, method):
+            return _METHOD_NOT_RETRYABLE
+
+        reason = (
+            _STATUS_REASONS[status]
+            if 0 <= status < _STATUS_TABLE_SIZE
+            else f"status_{status}"
+        )
+        if not self._status_retryable(tables, status):
+            return RetryDecision(False, 0.0, reason)
+        return RetryDecision(True, self.next_delay(attempt), reason)
+
     def should_retry(
         self,
         method: str,
@@ -60,19 +296,18 @@ class RetryPolicy:
         exc: Optional[BaseException] = None,
     ) -> bool:
         """Decide whether a retry should occur for given attempt, status or exception."""
-        if attempt >= self.max_attempts - 1:
+        tables = self._tables()
+        if attempt >= tables.last_attempt:
             return False
 
-        if method.upper() not in self.retry_on_methods:
+        if not self._method_allowed(tables, method):
             return False
 
         if exc is not None:
-            return any(isinstance(exc, t) for t in self.retry_on_exceptions)
+            return self._exception_retryable(tables, exc)
 
         if status is not None:
-            if status in self.give_up_on_status:
-                return False
-            return status in self.retry_on_status
+            return self._status_retryable(tables, status)
 
         return False
 
@@ -87,11 +322,5 @@ class RetryPolicy:
         self, exc: Exception, attempt: int
     ) -> Tuple[bool, float]:
         """Return (should_retry, delay) tuple for an exception."""
-        if attempt >= self.max_attempts - 1:
-            return False, 0.0
-
-        retryable = any(isinstance(exc, t) for t in self.retry_on_exceptions)
-        if not retryable:
-            return False, 0.0
-
-        return True, self.next_delay(attempt)
+        decision = self.decide("", attempt, exc=exc)
+        return decision.retry, decision.delay
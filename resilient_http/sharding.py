@@ -0,0 +1,209 @@
+import time
+import logging
+import importlib.util
+from urllib.parse import urlsplit
+from typing import Callable, Dict, Iterable, Optional, Set, Union
+
+import httpx
+import httpcore
+
+from .log_strategy import DEFAULT_LOG_STRATEGY, LogStrategy
+
+logger = logging.getLogger(__name__)
+
+# client_factory(http2, limits) -> client for one shard
+ClientFactory = Callable[[bool, Optional[httpx.Limits]], httpx.AsyncClient]
+
+
+def http2_available() -> bool:
+    """httpx speaks HTTP/2 only when the optional h2 package is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def resolve_http2(requested: bool) -> bool:
+    if requested and not http2_available():
+        logger.warning(
+            'event="http2_unavailable" fallback="http/1.1" '
+            'hint="pip install resilient-http[http2]"'
+        )
+        return False
+    return requested
+
+
+def _default_factory(http2: bool, limits: Optional[httpx.Limits]) -> httpx.AsyncClient:
+    if limits is None:
+        return httpx.AsyncClient(http2=http2)
+    return httpx.AsyncClient(http2=http2, limits=limits)
+
+
+def _copy_client(
+    template: httpx.AsyncClient, http2: bool, limits: Optional[httpx.Limits]
+) -> httpx.AsyncClient:
+    """A client with ``template``'s settings and, where possible, its own pool."""
+    transport = template._transport
+    pool = getattr(transport, "_pool", None)
+    if isinstance(transport, httpx.AsyncHTTPTransport) and (
+        type(pool) is httpcore.AsyncConnectionPool
+    ):
+        # Same TLS and socket settings, separate connections
+        if limits is None:
+            limits = httpx.Limits(
+                max_connections=pool._max_connections,
+                max_keepalive_connections=pool._max_keepalive_connections,
+                keepalive_expiry=pool._keepalive_expiry,
+            )
+        transport = httpx.AsyncHTTPTransport(
+            verify=pool._ssl_context or True,
+            http1=pool._http1,
+            http2=http2,
+            limits=limits,
+            retries=pool._retries,
+            local_address=pool._local_address,
+            uds=pool._uds,
+            socket_options=pool._socket_options,
+        )
+    # Other transports (mock, ASGI, custom) cannot be rebuilt and are shared
+
+    return httpx.AsyncClient(
+        auth=template.auth,
+        params=template.params,
+        headers=template.headers,
+        cookies=template.cookies.jar,
+        timeout=template.timeout,
+        follow_redirects=template.follow_redirects,
+        max_redirects=template.max_redirects,
+        event_hooks=template.event_hooks,
+        base_url=template.base_url,
+        trust_env=template.trust_env,
+        transport=transport,
+        mounts={pattern.pattern: t for pattern, t in template._mounts.items()},
+    )
+
+
+class ClientShards:
+    """
+    Dedicated httpx.AsyncClient shards for selected hosts.
+
+    Each shard has its own connection pool (``limits``), so one heavy host
+    cannot exhaust the connections shared by all other hosts. Requests to
+    hosts without a shard go to the client's default httpx.AsyncClient.
+
+    HTTP/2 is a per-client setting in httpx, so hosts listed in ``http2`` get
+    an HTTP/2 shard (``http2=True`` enables it for every shard). Without the
+    optional ``h2`` package, shards fall back to HTTP/1.1 with a warning.
+
+    With ``auto_shard_rps``, a host whose request rate over an ``interval``
+    second window reaches that threshold is promoted to its own shard, up to
+    ``max_shards`` in total; promotions are logged through ``log_strategy``.
+
+    Shards are built by ``client_factory(http2, limits)``. By default they copy
+    the settings (headers, auth, cookies, timeouts, event hooks, base_url,
+    proxies, TLS) of the client the shards are bound to, which
+    ResilientAsyncClient does with its own client, and get their own
+    connection pool. A custom transport (e.g. httpx.MockTransport) cannot be
+    rebuilt, so it is shared with that client.
+    """
+
+    def __init__(
+        self,
+        hosts: Iterable[str] = (),
+        http2: Union[bool, Iterable[str]] = False,
+        limits: Optional[httpx.Limits] = None,
+        auto_shard_rps: Optional[float] = None,
+        max_shards: int = 16,
+        interval: float = 5.0,
+        client_factory: Optional[ClientFactory] = None,
+        clock: Callable[[], float] = time.monotonic,
+        log_strategy: Optional[LogStrategy] = None,
+    ) -> None:
+        if auto_shard_rps is not None and auto_shard_rps <= 0:
+            raise ValueError("auto_shard_rps must be > 0")
+        if max_shards < 0:
+            raise ValueError("max_shards must be >= 0")
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+
+        if isinstance(http2, bool):
+            self._http2_all, self._http2_hosts = http2, set()
+        else:
+            self._http2_all, self._http2_hosts = False, {h.lower() for h in http2}
+        self._http2_enabled = resolve_http2(self._http2_all or bool(self._http2_hosts))
+
+        self.limits = limits
+        self.auto_shard_rps = auto_shard_rps
+        self.max_shards = max_shards
+        self.interval = interval
+        self.client_factory = client_factory
+        self.template: Optional[httpx.AsyncClient] = None
+        self._clock = clock
+        self.log_strategy = log_strategy or DEFAULT_LOG_STRATEGY
+
+        self.shards: Dict[str, httpx.AsyncClient] = {}
+        dedicated: Set[str] = {h.lower() for h in hosts} | self._http2_hosts
+        for host in sorted(dedicated):
+            self._add_shard(host)
+
+        self._counts: Dict[str, int] = {}
+        self._window_start = clock()
+
+    def _add_shard(self, host: str) -> httpx.AsyncClient:
+        http2 = self._http2_enabled and (self._http2_all or host in self._http2_hosts)
+        if self.client_factory is not None:
+            client = self.client_factory(http2, self.limits)
+        elif self.template is not None:
+            client = _copy_client(self.template, http2, self.limits)
+        else:
+            client = _default_factory(http2, self.limits)
+        self.shards[host] = client
+        return client
+
+    def bind(self, client: httpx.AsyncClient) -> None:
+        """Build shards from ``client``'s settings (see the class docstring)."""
+        if self.template is client:
+            return
+        if self.template is not None:
+            raise ValueError("these shards are already bound to another client")
+        self.template = client
+        if self.client_factory is None:
+            # Shards created so far have not served anything yet; rebuild them
+            # with the client's settings.
+            for host in list(self.shards):
+                self._add_shard(host)
+
+    def client_for(self, url: str) -> Optional[httpx.AsyncClient]:
+        """The shard serving ``url``, or None for the default client."""
+        if self.auto_shard_rps is None and not self.shards:
+            return None
+        host = (urlsplit(url).hostname or "").lower()
+        shard = self.shards.get(host)
+        if shard is None and self.auto_shard_rps is not None:
+            shard = self._observe(host)
+        return shard
+
+    def _observe(self, host: str) -> Optional[httpx.AsyncClient]:
+        self._counts[host] = self._counts.get(host, 0) + 1
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self.interval:
+            return None
+
+        assert self.auto_shard_rps is not None
+        hot = sorted(
+            (count / elapsed, h)
+            for h, count in self._counts.items()
+            if count / elapsed >= self.auto_shard_rps and h not in self.shards
+        )
+        self._counts.clear()
+        self._window_start = now
+        for rate, h in reversed(hot):
+            if len(self.shards) >= self.max_shards:
+                break
+            self.log_strategy.log(
+                logger, logging.INFO, "client_shard_created", h, rps=round(rate, 1)
+            )
+            self._add_shard(h)
+        return self.shards.get(host)
+
+    async def aclose(self) -> None:
+        for client in self.shards.values():
+            await client.aclose()
@@ -0,0 +1,218 @@
+import time
+import heapq
+import random
+from dataclasses import dataclass, asdict, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .retry_policy import RetryPolicy
+from .circuit_breaker import CircuitBreaker
+
+
+class VirtualClock:
+    """Manually advanced clock; pass it wherever a ``clock`` callable is taken."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class FaultWindow:
+    """Period of virtual time [start, end) with its own failure rate."""
+
+    start: float
+    end: float
+    failure_rate: float
+
+
+@dataclass
+class UpstreamModel:
+    """
+    Synthetic upstream: each attempt fails with the failure rate in effect when
+    it starts (answering ``failure_status``) and takes a latency drawn from
+    ``latency`` (exponential with ``mean_latency`` by default).
+    """
+
+    failure_rate: float = 0.0
+    mean_latency: float = 0.05
+    faults: Sequence[FaultWindow] = ()
+    failure_status: int = 503
+    latency: Optional[Callable[[random.Random], float]] = None
+
+    def failure_rate_at(self, t: float) -> float:
+        for window in self.faults:
+            if window.start <= t < window.end:
+                return window.failure_rate
+        return self.failure_rate
+
+
+@dataclass
+class SimulationReport:
+    duration: float
+    requests: int
+    attempts: int
+    succeeded: int
+    failed: int
+    rejected: int
+    amplification: float
+    peak_upstream_rps: float
+    breaker_open_time: float
+    breaker_openings: int
+    latency_p50: float
+    latency_p90: float
+    latency_p99: float
+    latency_max: float
+    wall_time: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+
+def simulate(
+    policy: RetryPolicy,
+    upstream: UpstreamModel,
+    rate: float,
+    duration: float,
+    breaker: Optional[CircuitBreaker] = None,
+    seed: Optional[int] = None,
+    method: str = "GET",
+    key: str = "GET upstream",
+) -> SimulationReport:
+    """
+    Simulate Poisson arrivals at ``rate`` requests/second for ``duration``
+    virtual seconds against ``upstream``, driving the real policy and breaker
+    without sleeping or doing I/O:
+
+        policy = RetryPolicy(max_attempts=5, backoff=full_jitter(exponential_backoff()))
+        upstream = UpstreamModel(faults=[FaultWindow(60, 180, failure_rate=0.3)])
+        report = simulate(policy, upstream, rate=500, duration=300)
+
+    The breaker, if given, is checked once per logical request and records its
+    final outcome, as in the clients' pipeline. The run uses a fresh copy of
+    it with the same settings and callbacks on the simulation's virtual clock,
+    so the breaker passed in is left untouched. Backoff randomness comes from
+    the policy's own backoff function; for a reproducible run, build it with a seeded rng (e.g.
+    ``full_jitter(exponential_backoff(), rng=random.Random(1))``).
+    """
+    if rate <= 0 or duration <= 0:
+        raise ValueError("rate and duration must be > 0")
+
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    sample_latency = upstream.latency or (
+        lambda r: r.expovariate(1.0 / upstream.mean_latency)
+    )
+    failure_rate_at = upstream.failure_rate_at
+    failure_status = upstream.failure_status
+    decide = policy.decide
+
+    open_time = 0.0
+    openings = 0
+    opened_at: Optional[float] = None
+    if breaker is not None:
+        user_on_open, user_on_closed = breaker.on_open, breaker.on_closed
+
+        def on_open(k: str) -> None:
+            nonlocal opened_at, openings
+            opened_at = clock.now
+            openings += 1
+            if callable(user_on_open):
+                user_on_open(k)
+
+        def on_closed(k: str) -> None:
+            nonlocal opened_at, open_time
+            if opened_at is not None:
+                open_time += clock.now - opened_at
+                opened_at = None
+            if callable(user_on_closed):
+                user_on_closed(k)
+
+        # Simulated failures and open circuits must not leak into the caller's
+        # breaker, so run on a fresh one built from its settings
+        breaker = replace(breaker, clock=clock, on_open=on_open, on_closed=on_closed)
+
+    # heap entries: (completion_time, seq, request_start, attempt, failed)
+    heap: List[Any] = []
+    push, pop = heapq.heappush, heapq.heappop
+    seq = 0
+    upstream_by_second: Dict[int, int] = {}
+    latencies: List[float] = []
+    requests = attempts = succeeded = failed = rejected = 0
+
+    started = time.perf_counter()
+    next_arrival = rng.expovariate(rate)
+    while heap or next_arrival < duration:
+        if next_arrival < duration and (not heap or next_arrival <= heap[0][0]):
+            now = clock.now = next_arrival
+            next_arrival += rng.expovariate(rate)
+            requests += 1
+            if breaker is not None and not breaker.allow_call(key):
+                rejected += 1
+                continue
+            start, attempt = now, 0
+        else:
+            now, _, start, attempt, attempt_failed = pop(heap)
+            clock.now = now
+            decision = decide(
+                method, attempt, status=failure_status if attempt_failed else 200
+            )
+            if not decision.retry:
+                latencies.append(now - start)
+                if attempt_failed:
+                    failed += 1
+                    if breaker is not None:
+                        breaker.record_failure(key)
+                else:
+                    succeeded += 1
+                    if breaker is not None:
+                        breaker.record_success(key)
+                continue
+            now += decision.delay
+            attempt += 1
+
+        # start an attempt at `now`
+        attempts += 1
+        second = int(now)
+        upstream_by_second[second] = upstream_by_second.get(second, 0) + 1
+        seq += 1
+        push(
+            heap,
+            (
+                now + sample_latency(rng),
+                seq,
+                start,
+                attempt,
+                rng.random() < failure_rate_at(now),
+            ),
+        )
+
+    if opened_at is not None:
+        open_time += clock.now - opened_at
+
+    latencies.sort()
+    return SimulationReport(
+        duration=clock.now,
+        requests=requests,
+        attempts=attempts,
+        succeeded=succeeded,
+        failed=failed,
+        rejected=rejected,
+        amplification=attempts / requests if requests else 0.0,
+        peak_upstream_rps=float(max(upstream_by_second.values(), default=0)),
+        breaker_open_time=open_time,
+        breaker_openings=openings,
+        latency_p50=_percentile(latencies, 50),
+        latency_p90=_percentile(latencies, 90),
+        latency_p99=_percentile(latencies, 99),
+        latency_max=latencies[-1] if latencies else 0.0,
+        wall_time=time.perf_counter() - started,
+    )
@@ -0,0 +1,212 @@
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+)
+
+if TYPE_CHECKING:
+    from .pipeline import RequestContext
+
+logger = logging.getLogger(__name__)
+
+# Lifecycle events, in the order they occur for one logical request. Attempt,
+# connection and backoff events repeat for every retry.
+REQUEST_START = "request_start"
+ATTEMPT_START = "attempt_start"
+CONNECTION_ACQUIRED = "connection_acquired"
+RESPONSE_HEADERS = "response_headers"
+ATTEMPT_END = "attempt_end"
+BACKOFF_START = "backoff_start"
+BACKOFF_END = "backoff_end"
+REQUEST_END = "request_end"
+
+# listener(event, ctx, timestamp, info)
+TraceListener = Callable[[str, "RequestContext", float, Any], None]
+
+
+class Tracer:
+    """
+    Dispatches request lifecycle events to listeners.
+
+    Each listener is called as ``listener(event, ctx, timestamp, info)`` where
+    ``timestamp`` comes from a monotonic clock and ``info`` depends on the
+    event: the response or exception for attempt_end / request_end, the delay
+    for backoff_start, otherwise None.
+
+    Clients only thread the tracer through a request while at least one
+    listener is attached, so an idle tracer costs one truthiness check per
+    request and one ``is None`` check per hook site.
+    """
+
+    def __init__(
+        self,
+        listeners: Iterable[TraceListener] = (),
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.listeners: List[TraceListener] = list(listeners)
+        self.clock = clock
+
+    def add_listener(self, listener: TraceListener) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: TraceListener) -> None:
+        self.listeners.remove(listener)
+
+    def emit(self, event: str, ctx: "RequestContext", info: Any = None) -> None:
+        now = self.clock()
+        for listener in self.listeners:
+            try:
+                listener(event, ctx, now, info)
+            except Exception:
+                logger.exception(f'event="trace_listener_failed" trace="{event}"')
+
+
+def traced_call(
+    tracer: Tracer, ctx: "RequestContext", call: Callable[["RequestContext"], Any]
+) -> Any:
+    """Run a bound pipeline between request_start and request_end events."""
+    ctx.tracer = tracer
+    tracer.emit(REQUEST_START, ctx)
+    try:
+        response = call(ctx)
+    except BaseException as exc:
+        tracer.emit(REQUEST_END, ctx, exc)
+        raise
+    tracer.emit(REQUEST_END, ctx, response)
+    return response
+
+
+async def atraced_call(
+    tracer: Tracer,
+    ctx: "RequestContext",
+    call: Callable[["RequestContext"], Awaitable[Any]],
+) -> Any:
+    """Async counterpart of traced_call()."""
+    ctx.tracer = tracer
+    tracer.emit(REQUEST_START, ctx)
+    try:
+        response = await call(ctx)
+    except BaseException as exc:
+        tracer.emit(REQUEST_END, ctx, exc)
+        raise
+    tracer.emit(REQUEST_END, ctx, response)
+    return response
+
+
+@dataclass
+class PhaseStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class PhaseProfiler:
+    """
+    Trace listener that aggregates time spent per phase, per request key.
+
+    Phases:
+
+    - ``admission``: request start to first attempt (breaker check, load
+      shedding queue and any other outer middleware);
+    - ``connect``: attempt start to connection acquired (async client only);
+    - ``ttfb``: connection acquired, or attempt start when the transport does
+      not report it, to response headers;
+    - ``body``: response headers to attempt end;
+    - ``attempt``: full attempt, whatever the transport reports;
+    - ``backoff``: sleep between attempts;
+    - ``total``: request start to request end.
+
+    Usage::
+
+        profiler = PhaseProfiler()
+        client = ResilientAsyncClient(tracer=Tracer([profiler]))
+        ...
+        profiler.summary()["GET https://api/x"]["backoff"]["total"]
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, PhaseStats]] = {}
+        self._marks: Dict[int, Dict[str, float]] = {}
+
+    def _add(self, key: str, phase: str, elapsed: float) -> None:
+        stats = self.phases.setdefault(key, {}).get(phase)
+        if stats is None:
+            stats = self.phases[key][phase] = PhaseStats()
+        stats.add(elapsed)
+
+    def __call__(
+        self, event: str, ctx: "RequestContext", timestamp: float, info: Any
+    ) -> None:
+        key = ctx.key
+        with self._lock:
+            if event == REQUEST_START:
+                self._marks[id(ctx)] = {REQUEST_START: timestamp}
+                return
+            marks = self._marks.get(id(ctx))
+            if marks is None:
+                # listener attached mid-request
+                return
+
+            if event == ATTEMPT_START:
+                if ATTEMPT_START not in marks:
+                    self._add(key, "admission", timestamp - marks[REQUEST_START])
+                marks[ATTEMPT_START] = timestamp
+                marks.pop(CONNECTION_ACQUIRED, None)
+                marks.pop(RESPONSE_HEADERS, None)
+            elif event == CONNECTION_ACQUIRED:
+                self._add(key, "connect", timestamp - marks[ATTEMPT_START])
+                marks[CONNECTION_ACQUIRED] = timestamp
+            elif event == RESPONSE_HEADERS:
+                since = marks.get(CONNECTION_ACQUIRED, marks[ATTEMPT_START])
+                self._add(key, "ttfb", timestamp - since)
+                marks[RESPONSE_HEADERS] = timestamp
+            elif event == ATTEMPT_END:
+                self._add(key, "attempt", timestamp - marks[ATTEMPT_START])
+                if RESPONSE_HEADERS in marks:
+                    self._add(key, "body", timestamp - marks[RESPONSE_HEADERS])
+            elif event == BACKOFF_START:
+                marks[BACKOFF_START] = timestamp
+            elif event == BACKOFF_END:
+                self._add(key, "backoff", timestamp - marks[BACKOFF_START])
+            elif event == REQUEST_END:
+                self._add(key, "total", timestamp - marks[REQUEST_START])
+                del self._marks[id(ctx)]
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{key: {phase: {"count", "total", "mean", "max"}}}"""
+        with self._lock:
+            return {
+                key: {
+                    phase: {
+                        "count": stats.count,
+                        "total": stats.total,
+                        "mean": stats.mean,
+                        "max": stats.max,
+                    }
+                    for phase, stats in phases.items()
+                }
+                for key, phases in self.phases.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.phases.clear()
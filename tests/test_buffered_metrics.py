@@ -0,0 +1,104 @@
+import httpx
+import pytest
+
+from resilient_http.metrics import BufferedMetricsSink, InMemoryMetricsSink
+from resilient_http.resilient_async_client import ResilientAsyncClient
+from resilient_http.retry_policy import RetryPolicy
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def record_retry(self, key, attempt, reason, delay):
+        self.events.append(("retry", key, attempt))
+
+    def record_circuit_state(self, key, state):
+        self.events.append(("state", key, state))
+
+    def record_request_latency(self, key, latency, success):
+        self.events.append(("latency", key, success))
+
+
+def test_events_reach_wrapped_sink_after_flush():
+    inner = InMemoryMetricsSink()
+    sink = BufferedMetricsSink(inner, flush_interval=60)
+
+    sink.record_retry("k", 0, "status_503", 0.1)
+    sink.record_request_latency("k", 0.2, True)
+    sink.record_circuit_state("k", "open")
+    sink.record_shed("k", "low", "saturated")
+    sink.flush()
+
+    entry = inner.summary()["k"]
+    assert entry["retries"] == 1
+    assert entry["successes"] == 1
+    assert entry["open_events"] == 1
+    assert entry["shed"] == 1
+    assert sink.pending() == 0
+    sink.close()
+
+
+def test_sink_without_record_batch_gets_individual_calls():
+    inner = ListSink()
+    sink = BufferedMetricsSink(inner, batch_size=2)
+    for attempt in range(5):
+        sink.record_retry("k", attempt, "x", 0.0)
+    sink.close()
+
+    assert [e[2] for e in inner.events] == [0, 1, 2, 3, 4]
+
+
+def test_protocol_only_sink_skips_unknown_and_failing_events():
+    class FlakySink(ListSink):
+        def record_circuit_state(self, key, state):
+            raise RuntimeError("boom")
+
+    inner = FlakySink()
+    sink = BufferedMetricsSink(inner, flush_interval=60)
+    sink.record_shed("k", "low", "saturated")
+    sink.record_circuit_state("k", "open")
+    for _ in range(5):
+        sink.record_request_latency("k", 0.1, True)
+    sink.close()
+
+    assert inner.events == [("latency", "k", True)] * 5
+
+
+@pytest.mark.parametrize(
+    "policy, kept", [("drop_newest", [0, 1, 2]), ("drop_oldest", [2, 3, 4])]
+)
+def test_drop_policies_count_dropped_events(policy, kept):
+    inner = ListSink()
+    sink = BufferedMetricsSink(inner, capacity=3, drop_policy=policy)
+    sink._thread = object()  # keep the drain thread from racing the assertions
+    for attempt in range(5):
+        sink.record_retry("k", attempt, "x", 0.0)
+
+    assert sink.dropped == 2
+    sink.flush()
+    assert [e[2] for e in inner.events] == kept
+
+
+def test_invalid_drop_policy():
+    with pytest.raises(ValueError):
+        BufferedMetricsSink(InMemoryMetricsSink(), drop_policy="block")
+
+
+@pytest.mark.asyncio
+async def test_async_client_flushes_buffered_sink_on_exit():
+    async def handler(request):
+        return httpx.Response(200)
+
+    inner = InMemoryMetricsSink()
+    sink = BufferedMetricsSink(inner, flush_interval=60)
+    transport = httpx.MockTransport(handler)
+    async with ResilientAsyncClient(
+        client=httpx.AsyncClient(transport=transport),
+        retry_policy=RetryPolicy(),
+        metrics=sink,
+    ) as client:
+        await client.get("http://svc/ok")
+
+    assert inner.summary()["GET http://svc/ok"]["successes"] == 1
+    await sink.aclose()
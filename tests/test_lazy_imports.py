@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import httpx
+import pytest
+import requests
+
+from resilient_http.retry_policy import RetryPolicy
+
+
+def _loaded_backends(statement):
+    code = (
+        f"import sys\n{statement}\n"
+        "print(','.join(m for m in ('requests', 'httpx') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return out.stdout.strip()
+
+
+def test_package_import_loads_no_backend():
+    assert _loaded_backends("import resilient_http") == ""
+    assert _loaded_backends("from resilient_http import RetryPolicy") == ""
+
+
+def test_each_client_loads_only_its_backend():
+    assert _loaded_backends("from resilient_http import ResilientAsyncClient") == (
+        "httpx"
+    )
+    assert (
+        _loaded_backends("from resilient_http import ResilientRequestsSession")
+        == "requests"
+    )
+
+
+def test_lazy_attribute_errors_for_unknown_names():
+    import resilient_http
+
+    assert "ResilientAsyncClient" in dir(resilient_http)
+    with pytest.raises(AttributeError):
+        resilient_http.DoesNotExist
+
+
+def test_default_exceptions_resolve_from_loaded_backends():
+    policy = RetryPolicy()
+    exceptions = set(policy.retry_on_exceptions)
+    assert {requests.Timeout, requests.ConnectionError} <= exceptions
+    assert {httpx.ConnectError, httpx.ReadTimeout} <= exceptions
+
+    should, _ = policy.should_retry_exception(httpx.ConnectError("x"), attempt=0)
+    assert should
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from resilient_http.exceptions import LoadShedError
+from resilient_http.load_shedding import Priority, PriorityScheduler
+from resilient_http.metrics import InMemoryMetricsSink
+from resilient_http.replica_pool import ReplicaPool
+from resilient_http.resilient_async_client import ResilientAsyncClient
+from resilient_http.resilient_session import ResilientRequestsSession
+
+
+@pytest.mark.asyncio
+async def test_saturated_host_sheds_low_and_admits_critical_first():
+    gate = asyncio.Event()
+    order = []
+
+    async def handler(request):
+        order.append(request.url.path)
+        if request.url.path == "/slow":
+            await gate.wait()
+        return httpx.Response(200)
+
+    sink = InMemoryMetricsSink()
+    scheduler = PriorityScheduler(max_in_flight=1, max_queue_time=5)
+    inner = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with ResilientAsyncClient(
+        client=inner, metrics=sink, scheduler=scheduler
+    ) as client:
+        slow = asyncio.create_task(client.get("http://svc/slow"))
+        await asyncio.sleep(0)
+        assert scheduler.in_flight("svc") == 1
+
+        with pytest.raises(LoadShedError):
+            await client.get("http://svc/bulk", priority=Priority.LOW)
+        assert sink.summary()["GET http://svc/bulk"]["shed"] == 1
+
+        normal = asyncio.create_task(client.get("http://svc/normal"))
+        critical = asyncio.create_task(
+            client.get("http://svc/critical", priority=Priority.CRITICAL)
+        )
+        await asyncio.sleep(0)
+        assert scheduler.queued("svc") == 2
+
+        gate.set()
+        await asyncio.gather(slow, normal, critical)
+
+    assert order == ["/slow", "/critical", "/normal"]
+    assert scheduler.in_flight("svc") == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_time_exceeded_is_shed():
+    scheduler = PriorityScheduler(max_in_flight=1, max_queue_time=0.01)
+    await scheduler.acquire_async("h")
+
+    with pytest.raises(LoadShedError, match="queue time"):
+        await scheduler.acquire_async("h", Priority.HIGH)
+
+    scheduler.release("h")
+    # the abandoned waiter must not hold the slot
+    await scheduler.acquire_async("h")
+    assert scheduler.in_flight("h") == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_evicts_less_important_waiter():
+    scheduler = PriorityScheduler(max_in_flight=1, max_queue_size=1, max_queue_time=5)
+    await scheduler.acquire_async("h")
+
+    normal = asyncio.create_task(scheduler.acquire_async("h", Priority.NORMAL))
+    await asyncio.sleep(0)
+    critical = asyncio.create_task(scheduler.acquire_async("h", Priority.CRITICAL))
+    await asyncio.sleep(0)
+
+    with pytest.raises(LoadShedError, match="evicted"):
+        await normal
+    scheduler.release("h")
+    await critical
+    assert scheduler.in_flight("h") == 1
+
+
+def test_sync_scheduler_hands_slot_to_waiting_thread():
+    scheduler = PriorityScheduler(max_in_flight=1, max_queue_time=5)
+    scheduler.acquire("h")
+    admitted = threading.Event()
+
+    def waiter():
+        scheduler.acquire("h", Priority.HIGH)
+        admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    while scheduler.queued("h") == 0:
+        pass
+    scheduler.release("h")
+    thread.join(timeout=5)
+
+    assert admitted.is_set()
+    assert scheduler.in_flight("h") == 1
+
+
+def test_sync_session_sheds_when_saturated():
+    scheduler = PriorityScheduler(max_in_flight=1)
+    session = ResilientRequestsSession(scheduler=scheduler)
+    session.session.request = lambda method, url, **kw: type(
+        "R", (), {"status_code": 200}
+    )()
+
+    scheduler.acquire("svc")
+    with pytest.raises(LoadShedError):
+        session.get("http://svc/x", priority=Priority.LOW)
+    scheduler.release("svc")
+
+    assert session.get("http://svc/x", priority=Priority.LOW).status_code == 200
+
+
+def test_replica_pool_requests_share_the_pool_budget():
+    scheduler = PriorityScheduler(max_in_flight=1)
+    session = ResilientRequestsSession(
+        replicas=ReplicaPool(["http://a.test", "http://b.test"], name="svc"),
+        scheduler=scheduler,
+    )
+    seen = []
+
+    def fake_request(method, url, **kw):
+        seen.append((url, scheduler.in_flight("svc"), scheduler.in_flight("")))
+        return type("R", (), {"status_code": 200})()
+
+    session.session.request = fake_request
+    session.get("/items")
+
+    assert seen[0][1:] == (1, 0)
+    scheduler.acquire("svc")
+    with pytest.raises(LoadShedError):
+        session.get("/items", priority=Priority.LOW)
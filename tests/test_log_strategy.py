@@ -0,0 +1,123 @@
+import logging
+import random
+
+import pytest
+
+from resilient_http.circuit_breaker import CircuitBreaker
+from resilient_http.exceptions import CircuitBreakerOpenError
+from resilient_http.log_strategy import LogStrategy
+from resilient_http.resilient_session import ResilientRequestsSession
+
+logger = logging.getLogger("resilient_http.test")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Counting:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+def test_disabled_level_costs_no_formatting(caplog):
+    caplog.set_level(logging.WARNING)
+    value = Counting()
+
+    LogStrategy().log(logger, logging.INFO, "retry", "k", reason=value)
+
+    assert value.formatted == 0
+    assert caplog.records == []
+
+
+def test_records_carry_structured_fields(caplog):
+    caplog.set_level(logging.INFO)
+    cb = CircuitBreaker(failure_threshold=1)
+
+    cb.record_failure("GET https://api/x")
+
+    (record,) = caplog.records
+    assert record.getMessage() == 'event="cb_open" key="GET https://api/x" failures=1'
+    assert (record.event, record.key, record.failures) == (
+        "cb_open",
+        "GET https://api/x",
+        1,
+    )
+
+
+def test_sampling_keeps_a_fraction(caplog):
+    caplog.set_level(logging.INFO)
+    strategy = LogStrategy(sample_rate=0.25, rng=random.Random(7))
+
+    for _ in range(2000):
+        strategy.log(logger, logging.INFO, "retry", "k")
+
+    assert 400 < len(caplog.records) < 600
+    assert caplog.records[0].sample_rate == 0.25
+
+
+def test_rate_limit_reports_suppressed_counts(caplog):
+    caplog.set_level(logging.INFO)
+    clock = FakeClock()
+    strategy = LogStrategy(rate_limit=2, period=1.0, clock=clock)
+
+    for _ in range(5):
+        strategy.log(logger, logging.INFO, "retry", "a")
+    strategy.log(logger, logging.INFO, "retry", "b")
+    assert len(caplog.records) == 3
+
+    clock.now = 1.0
+    strategy.log(logger, logging.INFO, "retry", "a")
+    assert caplog.records[-1].suppressed == 3
+
+    for _ in range(4):
+        strategy.log(logger, logging.INFO, "retry", "a")
+    strategy.flush()
+    last = caplog.records[-1]
+    assert (last.event, last.key, last.suppressed) == ("events_suppressed", "a", 3)
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        LogStrategy(sample_rate=0)
+    with pytest.raises(ValueError):
+        LogStrategy(rate_limit=0)
+
+
+def test_session_rejections_are_rate_limited(caplog):
+    caplog.set_level(logging.INFO)
+    session = ResilientRequestsSession(
+        log_strategy=LogStrategy(rate_limit=1, period=60)
+    )
+    session.cb.trip("GET http://down.test")
+
+    for _ in range(10):
+        with pytest.raises(CircuitBreakerOpenError):
+            session.get("http://down.test")
+
+    rejects = [r for r in caplog.records if getattr(r, "event", "") == "cb_reject"]
+    assert len(rejects) == 1
+
+
+def test_max_keys_caps_tracked_pairs_and_keeps_evicted_counts(caplog):
+    caplog.set_level(logging.INFO)
+    strategy = LogStrategy(rate_limit=1, period=60, max_keys=3, clock=FakeClock())
+
+    for i in range(1000):
+        strategy.log(logger, logging.INFO, "retry", f"key-{i}")
+        strategy.log(logger, logging.INFO, "retry", f"key-{i}")
+
+    assert len(strategy._windows) == 3
+    assert len(caplog.records) == 1000
+    caplog.clear()
+    strategy.flush()
+    counts = {r.key: r.suppressed for r in caplog.records}
+    assert counts == {"*": 997, "key-997": 1, "key-998": 1, "key-999": 1}
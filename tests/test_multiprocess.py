@@ -0,0 +1,126 @@
+import os
+import time
+
+import pytest
+
+from resilient_http.metrics import BufferedMetricsSink
+from resilient_http.multiprocess import (
+    KEY_SIZE,
+    MultiProcessCollector,
+    MultiProcessMetricsSink,
+)
+
+
+def test_workers_are_merged_on_read(tmp_path):
+    a = MultiProcessMetricsSink(str(tmp_path), worker_id="a")
+    b = MultiProcessMetricsSink(str(tmp_path), worker_id="b")
+    a.record_retry("k", 1, "status_503", 0.1)
+    b.record_retry("k", 1, "status_503", 0.1)
+    a.record_circuit_state("k", "open")
+    b.record_shed("other", "LOW", "saturated")
+    a.record_request_latency("k", 0.02, True)
+    b.record_request_latency("k", 30.0, False)
+
+    data = MultiProcessCollector(str(tmp_path)).collect()
+
+    assert data["k"]["retries"] == 2
+    assert data["k"]["open_events"] == 1
+    assert (data["k"]["successes"], data["k"]["failures"]) == (1, 1)
+    assert data["k"]["latency_sum"] == pytest.approx(30.02)
+    assert data["k"]["latency_count"] == 2
+    assert data["k"]["buckets"][0.025] == 1
+    assert data["k"]["buckets"][10.0] == 1
+    assert data["k"]["buckets"][float("inf")] == 2
+    assert data["other"]["shed"] == 1
+
+
+def test_file_grows_and_resumes_for_same_worker(tmp_path):
+    sink = MultiProcessMetricsSink(str(tmp_path), worker_id="w", capacity=1)
+    for i in range(10):
+        sink.record_request_latency(f"key-{i}", 0.5, True)
+    sink.close()
+
+    resumed = MultiProcessMetricsSink(str(tmp_path), worker_id="w")
+    resumed.record_retry("key-3", 1, "r", 0.0)
+    resumed.record_retry("x" * (KEY_SIZE + 10), 1, "r", 0.0)
+
+    data = MultiProcessCollector(str(tmp_path)).collect()
+    assert len(data) == 11
+    assert data["key-3"]["retries"] == 1
+    assert data["key-9"]["buckets"][0.5] == 1
+    assert "x" * KEY_SIZE in data
+
+
+def test_buffered_wrapper_uses_record_batch(tmp_path):
+    sink = BufferedMetricsSink(MultiProcessMetricsSink(str(tmp_path)))
+    for _ in range(5):
+        sink.record_request_latency("k", 0.2, True)
+    sink.close()
+
+    collector = MultiProcessCollector(str(tmp_path))
+    assert collector.collect()["k"]["successes"] == 5
+    assert collector.average_latency("k") == pytest.approx(0.2)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+def test_forked_child_writes_its_own_file(tmp_path):
+    sink = MultiProcessMetricsSink(str(tmp_path))
+    sink.record_retry("k", 1, "r", 0.0)
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - child process
+        try:
+            sink.record_retry("k", 1, "r", 0.0)
+            sink.close()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    sink.record_retry("k", 1, "r", 0.0)
+
+    collector = MultiProcessCollector(str(tmp_path))
+    assert len(collector.files()) == 2
+    assert collector.collect()["k"]["retries"] == 3
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+def test_buffered_sink_drains_in_forked_child(tmp_path):
+    sink = BufferedMetricsSink(MultiProcessMetricsSink(str(tmp_path)))
+    sink.record_retry("k", 1, "r", 0.0)
+    sink.flush()
+    assert sink._thread is not None
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - child process
+        code = 1
+        try:
+            for _ in range(3):
+                sink.record_retry("k", 1, "r", 0.0)
+            time.sleep(0.5)  # drained by the child's own thread, not close()
+            code = 0 if sink.pending() == 0 else 2
+            sink.close()
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    sink.close()
+
+    assert os.WEXITSTATUS(status) == 0
+    assert MultiProcessCollector(str(tmp_path)).collect()["k"]["retries"] == 4
+
+
+def test_sinks_in_one_process_write_separate_files(tmp_path):
+    a = MultiProcessMetricsSink(str(tmp_path))
+    b = MultiProcessMetricsSink(str(tmp_path))
+    a.record_retry("GET a", 1, "r", 0.0)
+    b.record_retry("GET b", 1, "r", 0.0)
+    a.record_retry("GET a", 1, "r", 0.0)
+
+    collector = MultiProcessCollector(str(tmp_path))
+    data = collector.collect()
+    assert len(collector.files()) == 2
+    assert (data["GET a"]["retries"], data["GET b"]["retries"]) == (2, 1)
+
+    first = MultiProcessMetricsSink(str(tmp_path), worker_id="w")
+    with pytest.raises(ValueError):
+        MultiProcessMetricsSink(str(tmp_path), worker_id="w")
+    first.close()
+    MultiProcessMetricsSink(str(tmp_path), worker_id="w").close()
@@ -0,0 +1,138 @@
+import json
+import time
+import zlib
+import threading
+
+import pytest
+
+from resilient_http import persistence
+from resilient_http.circuit_breaker import CircuitBreaker
+from resilient_http.metrics import InMemoryMetricsSink
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_snapshot_restore_rebases_onto_new_clock():
+    old = CircuitBreaker(
+        failure_threshold=2, recovery_timeout=30, clock=FakeClock(100.0)
+    )
+    old.record_failure("A")
+    old.record_failure("A")
+    old.record_failure("B")
+    old.clock.now = 110.0
+
+    state = old.snapshot()
+    assert state == {"failures": {"A": 2, "B": 1}, "open": {"A": 20.0}}
+
+    clock = FakeClock(5.0)
+    new = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=clock)
+    new.restore(state, elapsed=15.0)
+    assert new.state("A") == "open"
+    clock.now = 10.0
+    assert new.state("A") == "half-open"
+
+    new.record_failure("B")
+    assert new.state("B") == "open"
+
+
+def test_expired_recovery_window_restores_half_open():
+    cb = CircuitBreaker()
+    cb.restore({"failures": {"A": 5}, "open": {"A": 3.0}}, elapsed=60.0)
+    assert cb.state("A") == "half-open"
+    assert cb.allow_call("A")
+
+
+def test_bytes_roundtrip_with_metrics():
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    sink = InMemoryMetricsSink()
+    cb.record_failure("GET http://down")
+    sink.record_retry("GET http://down", 0, "status_503", 0.1)
+
+    blob = persistence.dumps(cb, sink)
+    assert isinstance(blob, bytes)
+
+    cb2, sink2 = CircuitBreaker(), InMemoryMetricsSink()
+    assert persistence.loads(blob, cb2, sink2)
+    assert cb2.state("GET http://down") == "open"
+    assert sink2.summary()["GET http://down"]["retries"] == 1
+
+
+def test_stale_or_missing_snapshot_is_cold_start(tmp_path, monkeypatch):
+    path = str(tmp_path / "cb.snap")
+    assert not persistence.load(path, CircuitBreaker())
+
+    cb = CircuitBreaker(failure_threshold=1)
+    cb.record_failure("X")
+    persistence.save(path, cb)
+
+    real_time = time.time
+    monkeypatch.setattr(persistence.time, "time", lambda: real_time() + 3600)
+    fresh = CircuitBreaker()
+    assert not persistence.load(path, fresh, max_age=60)
+    assert fresh.state("X") == "closed"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [1, 2],
+        {"version": persistence.SNAPSHOT_VERSION, "taken_at": 0, "breaker": [1]},
+        {
+            "version": persistence.SNAPSHOT_VERSION,
+            "taken_at": 0,
+            "breaker": {"failures": {"X": 1}, "open": {"Y": "soon"}},
+        },
+    ],
+)
+def test_malformed_snapshot_is_cold_start(tmp_path, payload):
+    path = tmp_path / "cb.snap"
+    path.write_bytes(zlib.compress(json.dumps(payload).encode()))
+    cb = CircuitBreaker()
+
+    assert not persistence.load(str(path), cb)
+    assert cb.snapshot() == {"failures": {}, "open": {}}
+
+
+@pytest.mark.asyncio
+async def test_checkpointer_writes_periodically_and_on_stop(tmp_path):
+    path = str(tmp_path / "cb.snap")
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+
+    async with persistence.BreakerCheckpointer(path, cb, interval=0.01):
+        cb.record_failure("GET http://x")
+
+    restored = CircuitBreaker()
+    assert persistence.load(path, restored)
+    assert restored.state("GET http://x") == "open"
+
+
+def test_concurrent_writers_leave_a_readable_snapshot(tmp_path):
+    path = str(tmp_path / "breaker.snap")
+    breaker = CircuitBreaker()
+    breaker.trip("A")
+    errors = []
+
+    def writer():
+        try:
+            for _ in range(20):
+                persistence.save(path, breaker)
+        except Exception as exc:  # pragma: no cover - failure path
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["breaker.snap"]
+    restored = CircuitBreaker()
+    assert persistence.load(path, restored)
+    assert restored.state("A") == "open"
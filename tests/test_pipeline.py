@@ -0,0 +1,189 @@
+import httpx
+import pytest
+import requests
+
+from resilient_http.circuit_breaker import CircuitBreaker
+from resilient_http.exceptions import CircuitBreakerOpenError
+from resilient_http.metrics import InMemoryMetricsSink
+from resilient_http.pipeline import (
+    STAGE_BULKHEAD,
+    STAGE_RATE_LIMIT,
+    Middleware,
+    Pipeline,
+    RequestContext,
+)
+from resilient_http.resilient_async_client import ResilientAsyncClient
+from resilient_http.resilient_session import ResilientRequestsSession
+from resilient_http.retry_policy import RetryPolicy
+
+
+class Recorder(Middleware):
+    def __init__(self, name, stage, calls):
+        self.name = name
+        self.stage = stage
+        self.calls = calls
+
+    def handle(self, ctx, call_next):
+        self.calls.append(self.name)
+        return call_next(ctx)
+
+    async def ahandle(self, ctx, call_next):
+        self.calls.append(self.name)
+        return await call_next(ctx)
+
+
+def _response(status):
+    return type("R", (), {"status_code": status})()
+
+
+def test_pipeline_orders_by_stage_and_empty_chain_is_transport():
+    calls = []
+    pipeline = Pipeline(
+        [
+            Recorder("bulkhead", STAGE_BULKHEAD, calls),
+            Recorder("rate", STAGE_RATE_LIMIT, calls),
+        ]
+    )
+    send = pipeline.bind(lambda ctx: calls.append("send") or ctx.key)
+
+    assert send(RequestContext("get", "http://x")) == "GET http://x"
+    assert calls == ["rate", "bulkhead", "send"]
+
+    transport = lambda ctx: "raw"  # noqa: E731
+    assert Pipeline().bind(transport) is transport
+
+
+def test_sync_open_circuit_raises_dedicated_error():
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=999)
+    session = ResilientRequestsSession(circuit_breaker=cb)
+    cb.record_failure("GET http://down.test")
+
+    with pytest.raises(CircuitBreakerOpenError):
+        session.get("http://down.test")
+
+
+def test_sync_records_latency_and_breaker_outcome():
+    sink = InMemoryMetricsSink()
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=999)
+    session = ResilientRequestsSession(
+        retry_policy=RetryPolicy(max_attempts=2, backoff=lambda a: 0.0),
+        circuit_breaker=cb,
+        metrics=sink,
+    )
+    statuses = [503, 503]
+    session.session.request = lambda method, url, **kw: _response(statuses.pop(0))
+
+    resp = session.get("http://flaky.test")
+    assert resp.status_code == 503
+
+    entry = sink.summary()["GET http://flaky.test"]
+    assert entry["retries"] == 1
+    assert entry["failures"] == 2
+    assert all(lat >= 0.0 for lat in entry["latencies"])
+    assert cb.state("GET http://flaky.test") == "open"
+
+
+def test_client_errors_do_not_trip_breaker():
+    cb = CircuitBreaker(failure_threshold=1)
+    session = ResilientRequestsSession(circuit_breaker=cb)
+    session.session.request = lambda method, url, **kw: _response(404)
+
+    assert session.get("http://missing.test").status_code == 404
+    assert cb.state("GET http://missing.test") == "closed"
+
+
+def test_sync_exception_exhaustion_trips_breaker(monkeypatch):
+    cb = CircuitBreaker(failure_threshold=1)
+    session = ResilientRequestsSession(
+        retry_policy=RetryPolicy(max_attempts=2, backoff=lambda a: 0.0),
+        circuit_breaker=cb,
+    )
+
+    def boom(method, url, **kw):
+        raise requests.ConnectionError("down")
+
+    session.session.request = boom
+    with pytest.raises(requests.ConnectionError):
+        session.get("http://gone.test")
+    assert cb.state("GET http://gone.test") == "open"
+
+
+@pytest.mark.asyncio
+async def test_async_client_runs_custom_middleware():
+    calls = []
+
+    async def handler(request):
+        return httpx.Response(200)
+
+    inner = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with ResilientAsyncClient(
+        client=inner, middleware=[Recorder("rate", STAGE_RATE_LIMIT, calls)]
+    ) as client:
+        resp = await client.get("http://ok.test")
+
+    assert resp.status_code == 200
+    assert calls == ["rate"]
+
+
+def test_reassigning_client_attributes_rebuilds_the_chain():
+    session = ResilientRequestsSession(retry_policy=RetryPolicy(max_attempts=1))
+    calls = []
+
+    def fake_request(method, url, **kw):
+        calls.append(url)
+        return _response(503 if len(calls) == 1 else 200)
+
+    session.session.request = fake_request
+    session.retry_policy = RetryPolicy(max_attempts=2, backoff=lambda attempt: 0.0)
+    sink = InMemoryMetricsSink()
+    session.metrics = sink
+
+    assert session.get("http://svc.test").status_code == 200
+    assert len(calls) == 2
+    assert sink.data["GET http://svc.test"]["retries"] == 1
+
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=999)
+    session.cb = cb
+    cb.trip("GET http://svc.test")
+    with pytest.raises(CircuitBreakerOpenError):
+        session.get("http://svc.test")
+
+
+@pytest.mark.asyncio
+async def test_async_client_picks_up_new_breaker():
+    client = ResilientAsyncClient(
+        client=httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200))
+        )
+    )
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=999)
+    client.circuit_breaker = cb
+    cb.trip("GET http://svc.test")
+
+    with pytest.raises(CircuitBreakerOpenError):
+        await client.get("http://svc.test")
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_frees_its_slot():
+    import asyncio
+
+    async def slow(request):
+        await asyncio.sleep(10)
+
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+    client = ResilientAsyncClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(slow)),
+        circuit_breaker=cb,
+    )
+    key = "GET http://svc.test"
+    cb.trip(key)
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(client.get("http://svc.test"), 0.05)
+
+    assert cb.state(key) == "half-open"
+    assert cb.allow_call(key)
+    await client.close()
@@ -0,0 +1,165 @@
+import random
+import logging
+
+import httpx
+import pytest
+
+from resilient_http.circuit_breaker import CircuitBreaker
+from resilient_http.replica_pool import ReplicaPool
+from resilient_http.resilient_async_client import ResilientAsyncClient
+from resilient_http.resilient_session import ResilientRequestsSession
+from resilient_http.retry_policy import RetryPolicy
+
+
+def _response(status):
+    return type("R", (), {"status_code": status})()
+
+
+def test_p2c_prefers_less_loaded_replica():
+    pool = ReplicaPool(["http://a", "http://b"], rng=random.Random(0))
+    a, b = pool.replicas
+    a.ewma_latency = b.ewma_latency = 0.01
+    a.in_flight = 10
+
+    assert pool.acquire().base_url == "http://b"
+
+
+def test_consecutive_failures_eject_replica():
+    pool = ReplicaPool(["http://a", "http://b"], consecutive_failures=2)
+    a = pool.replicas[0]
+    for _ in range(2):
+        a.in_flight += 1
+        pool.release(a, 0.01, failed=True)
+
+    assert pool.breaker.state("http://a") == "open"
+    assert {pool.acquire().base_url for _ in range(10)} == {"http://b"}
+
+
+def test_failure_rate_and_latency_outliers_are_ejected(caplog):
+    caplog.set_level(logging.INFO)
+    now = [0.0]
+    pool = ReplicaPool(
+        ["http://a", "http://b", "http://c", "http://d"],
+        breaker=CircuitBreaker(failure_threshold=1000),
+        interval=10.0,
+        min_requests=5,
+        clock=lambda: now[0],
+    )
+    a, b, c, d = pool.replicas
+    for _ in range(10):
+        for replica, latency, failed in (
+            (a, 0.01, True),
+            (b, 0.5, False),
+            (c, 0.01, False),
+            (d, 0.01, False),
+        ):
+            replica.in_flight += 1
+            pool.release(replica, latency, failed)
+
+    now[0] = 11.0
+    d.in_flight += 1
+    pool.release(d, 0.01, False)
+
+    assert pool.breaker.state("http://a") == "open"
+    assert pool.breaker.state("http://b") == "open"
+    assert pool.breaker.state("http://c") == "closed"
+    ejected = [
+        r for r in caplog.records if getattr(r, "event", "") == "replica_ejected"
+    ]
+    assert sorted(r.key for r in ejected) == ["http://a", "http://b"]
+
+
+def test_max_ejection_percent_caps_outlier_ejection():
+    now = [0.0]
+    pool = ReplicaPool(
+        ["http://a", "http://b"],
+        breaker=CircuitBreaker(failure_threshold=1000),
+        min_requests=1,
+        max_ejection_percent=0,
+        clock=lambda: now[0],
+    )
+    a = pool.replicas[0]
+    a.in_flight += 1
+    pool.release(a, 0.01, True)
+    now[0] = 100.0
+    a.in_flight += 1
+    pool.release(a, 0.01, True)
+
+    assert pool.breaker.state("http://a") == "closed"
+
+
+def test_all_ejected_falls_back_to_panic_mode():
+    pool = ReplicaPool(["http://a"], consecutive_failures=1)
+    pool.breaker.trip("http://a")
+    assert pool.acquire().base_url == "http://a"
+
+
+def test_sync_retry_moves_to_another_replica():
+    seen = []
+
+    def fake_request(method, url, **kw):
+        seen.append(url)
+        return _response(503 if url.startswith("http://bad") else 200)
+
+    session = ResilientRequestsSession(
+        retry_policy=RetryPolicy(max_attempts=2, backoff=lambda a: 0.0),
+        replicas=["http://bad/api", "http://good/api"],
+    )
+    session.session.request = fake_request
+    # make the first pick deterministic
+    session.replica_pool.replicas[1].in_flight = 100
+    session.replica_pool.replicas[1].ewma_latency = 1.0
+    session.replica_pool.replicas[0].ewma_latency = 0.001
+
+    resp = session.get("/users")
+
+    assert resp.status_code == 200
+    assert seen == ["http://bad/api/users", "http://good/api/users"]
+    assert session.replica_pool.replicas[1].in_flight == 100
+
+
+@pytest.mark.asyncio
+async def test_async_client_routes_through_pool():
+    hosts = []
+
+    async def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host == "down":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    inner = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    pool = ReplicaPool(["http://down", "http://up"], rng=random.Random(1))
+    async with ResilientAsyncClient(
+        client=inner,
+        retry_policy=RetryPolicy(max_attempts=2, backoff=lambda a: 0.0),
+        replicas=pool,
+    ) as client:
+        for _ in range(5):
+            resp = await client.get("/ping")
+            assert resp.status_code == 200
+
+    assert hosts.count("up") == 5
+    assert all(r.in_flight == 0 for r in pool.replicas)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_returns_replica_to_rotation():
+    import asyncio
+
+    async def slow(request):
+        await asyncio.sleep(10)
+
+    pool = ReplicaPool(["http://a.test"], ejection_time=0.01)
+    client = ResilientAsyncClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(slow)), replicas=pool
+    )
+    pool.breaker.trip("http://a.test")
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(client.get("/x"), 0.05)
+
+    assert pool.replicas[0].in_flight == 0
+    assert pool.breaker.allow_call("http://a.test")
+    await client.close()
@@ -0,0 +1,57 @@
+import copy
+
+import httpx
+from requests import ConnectionError as RequestsConnectionError, Timeout
+
+from resilient_http.retry_policy import RetryDecision, RetryPolicy
+
+
+def test_decide_status_returns_decision_delay_and_reason():
+    policy = RetryPolicy(max_attempts=3, backoff=lambda attempt: 0.5)
+
+    assert policy.decide("GET", 0, status=503) == RetryDecision(True, 0.5, "status_503")
+    assert policy.decide("get", 0, status=503).retry
+    assert policy.decide("GET", 0, status=404) == RetryDecision(
+        False, 0.0, "status_404"
+    )
+    assert policy.decide("POST", 0, status=503).reason == "method_not_retryable"
+    assert policy.decide("GET", 2, status=503).reason == "attempts_exhausted"
+
+
+def test_decide_exception_uses_class_cache():
+    policy = RetryPolicy(max_attempts=3, backoff=lambda attempt: 0.1)
+
+    decision = policy.decide("POST", 0, exc=Timeout())
+    assert decision == RetryDecision(True, 0.1, "Timeout")
+    assert not policy.decide("GET", 0, exc=ValueError("boom")).retry
+    assert policy.decide("GET", 0, exc=httpx.ConnectError("x")).retry
+
+    custom = RetryPolicy(retry_on_exceptions=[KeyError])
+    assert custom.decide("GET", 0, exc=KeyError("k")).retry
+    assert not custom.decide("GET", 0, exc=RequestsConnectionError()).retry
+
+
+def test_status_outside_lookup_table():
+    policy = RetryPolicy(retry_on_status={799}, give_up_on_status=set())
+    assert policy.decide("GET", 0, status=799).retry
+    assert not policy.decide("GET", 0, status=798).retry
+
+
+def test_mutation_recompiles_tables():
+    policy = RetryPolicy(max_attempts=3)
+    assert not policy.should_retry("GET", 0, status=418)
+
+    policy.retry_on_status.add(418)
+    assert policy.should_retry("GET", 0, status=418)
+
+    policy.retry_on_status = {500}
+    assert not policy.should_retry("GET", 0, status=418)
+
+    policy.max_attempts = 1
+    assert not policy.should_retry("GET", 0, status=500)
+
+
+def test_copied_policy_keeps_tracking_mutations():
+    clone = copy.deepcopy(RetryPolicy())
+    clone.retry_on_methods.add("POST")
+    assert clone.should_retry("POST", 0, status=503)
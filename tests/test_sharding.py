@@ -0,0 +1,170 @@
+import logging
+
+import httpx
+import pytest
+
+from resilient_http import sharding
+from resilient_http.circuit_breaker import CircuitBreaker
+from resilient_http.resilient_async_client import ResilientAsyncClient
+from resilient_http.retry_policy import RetryPolicy
+from resilient_http.sharding import ClientShards
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _tagged_factory(created, status=200):
+    def factory(http2, limits):
+        name = f"shard{len(created)}"
+        created.append((name, http2, limits))
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(status, text=name)
+            )
+        )
+
+    return factory
+
+
+def _default_client():
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text="default")
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_dedicated_hosts_get_their_own_client_and_limits():
+    created = []
+    limits = httpx.Limits(max_connections=5)
+    shards = ClientShards(
+        hosts=["Heavy.test"], limits=limits, client_factory=_tagged_factory(created)
+    )
+    async with ResilientAsyncClient(client=_default_client(), shards=shards) as client:
+        assert (await client.get("https://heavy.test:8443/a")).text == "shard0"
+        assert (await client.get("https://light.test/a")).text == "default"
+
+    assert created == [("shard0", False, limits)]
+    assert shards.shards["heavy.test"].is_closed
+
+
+@pytest.mark.asyncio
+async def test_hot_host_is_promoted_after_window(caplog):
+    caplog.set_level(logging.INFO)
+    clock = FakeClock()
+    created = []
+    shards = ClientShards(
+        auto_shard_rps=10,
+        interval=1.0,
+        max_shards=1,
+        client_factory=_tagged_factory(created),
+        clock=clock,
+    )
+    client = ResilientAsyncClient(client=_default_client(), shards=shards)
+
+    for _ in range(20):
+        await client.get("https://hot.test/x")
+    await client.get("https://warm.test/x")
+    clock.now = 1.0
+    assert (await client.get("https://hot.test/x")).text == "shard0"
+    assert (await client.get("https://warm.test/x")).text == "default"
+    assert list(shards.shards) == ["hot.test"]
+    (record,) = [
+        r for r in caplog.records if getattr(r, "event", "") == "client_shard_created"
+    ]
+    assert (record.key, record.rps) == ("hot.test", 21.0)
+    await client.close()
+
+
+def test_http2_falls_back_without_h2(monkeypatch, caplog):
+    monkeypatch.setattr(sharding, "http2_available", lambda: False)
+    created = []
+    with caplog.at_level(logging.WARNING):
+        ClientShards(http2=["h2.test"], client_factory=_tagged_factory(created))
+
+    assert created[0][1] is False
+    assert "http2_unavailable" in caplog.text
+
+
+def test_http2_hosts_only_enable_http2_for_those_shards(monkeypatch):
+    monkeypatch.setattr(sharding, "http2_available", lambda: True)
+    created = []
+    shards = ClientShards(
+        hosts=["plain.test"],
+        http2=["mux.test"],
+        client_factory=_tagged_factory(created),
+    )
+
+    assert [http2 for _, http2, _ in created] == [True, False]
+    assert set(shards.shards) == {"mux.test", "plain.test"}
+
+
+@pytest.mark.asyncio
+async def test_breaker_and_retries_span_shards():
+    created = []
+    shards = ClientShards(
+        hosts=["down.test"], client_factory=_tagged_factory(created, status=503)
+    )
+    cb = CircuitBreaker(failure_threshold=1, recovery_timeout=999)
+    client = ResilientAsyncClient(
+        client=_default_client(),
+        shards=shards,
+        circuit_breaker=cb,
+        retry_policy=RetryPolicy(max_attempts=2, backoff=lambda attempt: 0.0),
+    )
+
+    response = await client.get("https://down.test/x")
+    assert response.status_code == 503
+    assert cb.state("GET https://down.test/x") == "open"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_promoted_shard_keeps_the_wrapped_clients_settings():
+    clock = FakeClock()
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("authorization"))
+        return httpx.Response(200)
+
+    transport = httpx.MockTransport(handler)
+    wrapped = httpx.AsyncClient(
+        transport=transport, headers={"Authorization": "Bearer t"}, timeout=3.0
+    )
+    shards = ClientShards(auto_shard_rps=1, interval=1.0, clock=clock)
+    client = ResilientAsyncClient(client=wrapped, shards=shards)
+
+    await client.get("https://hot.test/x")
+    clock.now = 1.0
+    await client.get("https://hot.test/x")
+
+    shard = shards.shards["hot.test"]
+    assert shard is not wrapped
+    assert shard._transport is transport
+    assert shard.timeout == httpx.Timeout(3.0)
+    assert seen == ["Bearer t", "Bearer t"]
+    await client.close()
+
+
+def test_dedicated_shards_get_their_own_pool_with_the_clients_settings():
+    limits = httpx.Limits(max_connections=5)
+    wrapped = httpx.AsyncClient(headers={"X-Team": "search"}, verify=False)
+    shards = ClientShards(hosts=["heavy.test"], limits=limits)
+    ResilientAsyncClient(client=wrapped, shards=shards)
+
+    shard = shards.shards["heavy.test"]
+    pool = shard._transport._pool
+    assert shard.headers["x-team"] == "search"
+    assert pool is not wrapped._transport._pool
+    assert pool._max_connections == 5
+    assert pool._ssl_context is wrapped._transport._pool._ssl_context
+
+    with pytest.raises(ValueError):
+        ResilientAsyncClient(client=httpx.AsyncClient(), shards=shards)
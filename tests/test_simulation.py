@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from resilient_http.backoff import exponential_backoff, full_jitter
+from resilient_http.circuit_breaker import CircuitBreaker
+from resilient_http.retry_policy import RetryPolicy
+from resilient_http.simulation import FaultWindow, UpstreamModel, simulate
+
+
+def _policy(max_attempts=5, seed=1):
+    return RetryPolicy(
+        max_attempts=max_attempts,
+        backoff=full_jitter(exponential_backoff(), rng=random.Random(seed)),
+    )
+
+
+def test_healthy_upstream_has_no_amplification():
+    report = simulate(_policy(), UpstreamModel(), rate=200, duration=10, seed=1)
+
+    assert report.requests > 0
+    assert report.attempts == report.requests
+    assert report.amplification == 1.0
+    assert report.failed == 0
+    assert report.latency_p50 <= report.latency_p99 <= report.latency_max
+
+
+def test_fault_window_amplifies_load_within_max_attempts():
+    upstream = UpstreamModel(faults=[FaultWindow(2, 8, failure_rate=0.3)])
+    report = simulate(_policy(max_attempts=5), upstream, rate=500, duration=10, seed=2)
+
+    assert 1.0 < report.amplification < 5.0
+    assert report.succeeded + report.failed == report.requests
+    assert report.peak_upstream_rps > 500
+
+
+def test_seeded_runs_are_reproducible():
+    upstream = UpstreamModel(failure_rate=0.2)
+    a = simulate(_policy(seed=3), upstream, rate=100, duration=5, seed=3)
+    b = simulate(_policy(seed=3), upstream, rate=100, duration=5, seed=3)
+
+    assert a.as_dict() | {"wall_time": 0} == b.as_dict() | {"wall_time": 0}
+
+
+def test_breaker_open_time_and_rejections_are_reported():
+    opened = []
+    breaker = CircuitBreaker(
+        failure_threshold=3, recovery_timeout=1.0, on_open=opened.append
+    )
+    upstream = UpstreamModel(failure_rate=1.0, mean_latency=0.01)
+    report = simulate(
+        _policy(max_attempts=1),
+        upstream,
+        rate=100,
+        duration=10,
+        breaker=breaker,
+        seed=4,
+    )
+
+    assert report.rejected > 0
+    assert report.breaker_openings >= 1
+    assert report.breaker_open_time > 5.0
+    assert opened  # user callbacks still fire
+    assert breaker.on_open == opened.append
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        simulate(_policy(), UpstreamModel(), rate=0, duration=1)
+
+
+def test_callers_breaker_is_left_untouched():
+    opened = []
+    breaker = CircuitBreaker(on_open=opened.append)
+    original_clock = breaker.clock
+    breaker.record_failure("GET other")
+    before = breaker.snapshot()
+
+    simulate(
+        _policy(),
+        UpstreamModel(failure_rate=1.0),
+        rate=50,
+        duration=5,
+        breaker=breaker,
+        seed=1,
+    )
+
+    assert breaker.clock is original_clock
+    assert breaker.on_open == opened.append
+    assert opened
+    assert breaker.state("GET upstream") == "closed"
+    assert breaker.snapshot() == before
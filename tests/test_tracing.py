@@ -0,0 +1,127 @@
+import httpx
+import pytest
+
+from resilient_http.pipeline import RequestContext
+from resilient_http.resilient_async_client import ResilientAsyncClient
+from resilient_http.resilient_session import ResilientRequestsSession
+from resilient_http.retry_policy import RetryPolicy
+from resilient_http.tracing import PhaseProfiler, Tracer
+
+
+def _no_backoff_policy(**kwargs):
+    return RetryPolicy(backoff=lambda attempt: 0.0, **kwargs)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+def test_sync_lifecycle_events_in_order():
+    events = []
+    tracer = Tracer([lambda event, ctx, ts, info: events.append(event)])
+    session = ResilientRequestsSession(
+        retry_policy=_no_backoff_policy(max_attempts=2), tracer=tracer
+    )
+    statuses = [503, 200]
+
+    def fake_request(method, url, **kw):
+        response = type("R", (), {"status_code": statuses.pop(0)})()
+        for hook in kw["hooks"]["response"]:
+            hook(response)
+        return response
+
+    session.session.request = fake_request
+
+    assert session.get("http://svc.test/x").status_code == 200
+    attempt = ["attempt_start", "response_headers", "attempt_end"]
+    assert events == [
+        "request_start",
+        *attempt,
+        "backoff_start",
+        "backoff_end",
+        *attempt,
+        "request_end",
+    ]
+
+
+def test_user_response_hooks_still_run_when_tracing():
+    seen = []
+    tracer = Tracer([lambda *args: None])
+    session = ResilientRequestsSession(tracer=tracer)
+    session.session.hooks["response"].append(lambda r, **kw: seen.append("session"))
+
+    def fake_request(method, url, **kw):
+        response = type("R", (), {"status_code": 200})()
+        for hook in kw["hooks"]["response"]:
+            hook(response)
+        return response
+
+    session.session.request = fake_request
+    session.get("http://svc.test/x")
+
+    assert seen == ["session"]
+
+
+def test_no_listener_leaves_request_untouched():
+    session = ResilientRequestsSession()
+    captured = {}
+
+    def fake_request(method, url, **kw):
+        captured.update(kw)
+        return type("R", (), {"status_code": 200})()
+
+    session.session.request = fake_request
+    session.get("http://svc.test/x", timeout=1)
+
+    assert captured == {"timeout": 1}
+
+
+@pytest.mark.asyncio
+async def test_async_profiler_breaks_down_phases():
+    user_events = []
+
+    async def user_trace(name, info):
+        user_events.append(name)
+
+    async def handler(request):
+        # MockTransport bypasses httpcore, so replay the events it would emit
+        trace = request.extensions["trace"]
+        await trace("http11.send_request_headers.started", {})
+        await trace("http11.receive_response_headers.complete", {})
+        return httpx.Response(200)
+
+    profiler = PhaseProfiler()
+    client = ResilientAsyncClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        tracer=Tracer([profiler], clock=FakeClock()),
+    )
+    async with client:
+        await client.get("https://api.test/x", extensions={"trace": user_trace})
+
+    assert user_events == [
+        "http11.send_request_headers.started",
+        "http11.receive_response_headers.complete",
+    ]
+    phases = profiler.summary()["GET https://api.test/x"]
+    # one clock tick between consecutive events
+    assert {name: stats["total"] for name, stats in phases.items()} == {
+        "admission": 1.0,
+        "connect": 1.0,
+        "ttfb": 1.0,
+        "body": 1.0,
+        "attempt": 3.0,
+        "total": 5.0,
+    }
+
+
+def test_failing_listener_does_not_break_request():
+    def broken(event, ctx, ts, info):
+        raise RuntimeError("listener bug")
+
+    tracer = Tracer([broken])
+    tracer.emit("request_start", RequestContext("GET", "http://x"))